@@ -21,49 +21,55 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def check_permissions() -> bool:
-    """Check platform permissions and warn if not configured."""
+def _permission_warning() -> tuple[str, str] | None:
+    """Return (text, details) for a missing platform permission, if any.
+
+    Doesn't need Qt, so it runs before the QApplication is created.
+    """
     platform = get_platform()
 
     if platform == "linux" and not check_input_group():
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Icon.Warning)
-        msg.setWindowTitle("Talki - Setup Required")
-        msg.setText("Your user is not in the 'input' group.")
-        msg.setInformativeText(
+        return (
+            "Your user is not in the 'input' group.",
             "This is required for global hotkeys and text injection on Linux.\n\n"
             "Run the following command, then log out and back in:\n\n"
             "  sudo usermod -aG input $USER\n\n"
-            "The application will start, but hotkeys may not work."
+            "The application will start, but hotkeys may not work.",
         )
-        msg.setStandardButtons(
-            QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel)
-        msg.setDefaultButton(QMessageBox.StandardButton.Ok)
-        result = msg.exec()
-        if result == QMessageBox.StandardButton.Cancel:
-            return False
 
     if platform == "macos" and not check_accessibility_permissions():
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Icon.Warning)
-        msg.setWindowTitle("Talki - Setup Required")
-        msg.setText("Accessibility permissions not granted.")
-        msg.setInformativeText(
+        return (
+            "Accessibility permissions not granted.",
             "This is required for global hotkeys and text injection on macOS.\n\n"
             "Go to: System Settings > Privacy & Security > Accessibility\n"
             "Add and enable this application.\n\n"
-            "The application will start, but hotkeys may not work."
+            "The application will start, but hotkeys may not work.",
         )
-        msg.setStandardButtons(
-            QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel)
-        result = msg.exec()
-        if result == QMessageBox.StandardButton.Cancel:
-            return False
 
-    return True
+    return None
+
+
+def _warn(text: str, informative_text: str) -> bool:
+    """Show a setup warning. Returns False if the user cancelled."""
+    msg = QMessageBox()
+    msg.setIcon(QMessageBox.Icon.Warning)
+    msg.setWindowTitle("Talki - Setup Required")
+    msg.setText(text)
+    msg.setInformativeText(informative_text)
+    msg.setStandardButtons(
+        QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel)
+    msg.setDefaultButton(QMessageBox.StandardButton.Ok)
+    return msg.exec() != QMessageBox.StandardButton.Cancel
 
 
 def main():
+    warning = _permission_warning()
+    if warning is not None:
+        logger.warning("%s", warning[0])
+
+    config = Config.load()
+    logger.info("Config loaded: %s", config)
+
     # High-DPI support
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
@@ -72,12 +78,9 @@ def main():
     qt_app.setApplicationName("Talki")
     qt_app.setQuitOnLastWindowClosed(False)
 
-    if not check_permissions():
+    if warning is not None and not _warn(*warning):
         sys.exit(0)
 
-    config = Config.load()
-    logger.info("Config loaded: %s", config)
-
     app = SpeechInjectorApp(config)
     app.initialize()
 
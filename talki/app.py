@@ -1,8 +1,12 @@
 """Core application controller - orchestrates all components."""
 
 import logging
+from dataclasses import replace
+from functools import partial
 
-from PySide6.QtCore import QObject, Slot
+from PySide6.QtCore import (
+    QObject, QThread, QThreadPool, QTimer, Qt, Signal, Slot,
+)
 from PySide6.QtWidgets import QApplication
 
 from .config import Config
@@ -15,20 +19,42 @@ from .settings_ui import SettingsDialog
 
 logger = logging.getLogger(__name__)
 
+# The input stream stays open between sessions so recording starts without
+# PortAudio setup latency, but is closed after this long without one so the
+# OS microphone indicator doesn't stay on.
+STREAM_IDLE_CLOSE_MS = 30_000
+
 
 class SpeechInjectorApp(QObject):
+    # Emitted from a pool thread with the loaded Transcriber (None on failure).
+    _model_ready = Signal(object)
+    # Queued to the transcription worker: (audio capture, session id, interval ms).
+    _start_session = Signal(object, int, int)
+    _stop_session = Signal()
+
     def __init__(self, config: Config, parent: QObject | None = None):
         super().__init__(parent)
         self._config = config
+        self._model_ready.connect(self._on_model_ready)
 
         # Components
         self._audio_capture = AudioCapture()
         self._transcriber: Transcriber | None = None
         self._worker: TranscriptionWorker | None = None
+        self._worker_thread: QThread | None = None
+        self._session_id = 0
+        self._pending_text: list[str] = []
+        # Single thread so injected text keeps its order.
+        self._inject_pool = QThreadPool(self)
+        self._inject_pool.setMaxThreadCount(1)
         self._hotkey_manager: BaseHotkeyManager | None = None
         self._text_injector: BaseTextInjector | None = None
         self._tray: TrayIcon | None = None
         self._session_source: str | None = None
+        self._stream_idle_timer = QTimer(self)
+        self._stream_idle_timer.setSingleShot(True)
+        self._stream_idle_timer.setInterval(STREAM_IDLE_CLOSE_MS)
+        self._stream_idle_timer.timeout.connect(self._close_idle_stream)
 
     def initialize(self):
         """Initialize all components. Call after QApplication is ready."""
@@ -38,6 +64,18 @@ class SpeechInjectorApp(QObject):
         self._tray.quit_requested.connect(self._quit)
         self._tray.show()
 
+        # One transcription worker for the app lifetime, on its own thread.
+        self._worker = TranscriptionWorker()
+        self._worker_thread = QThread()
+        self._worker.moveToThread(self._worker_thread)
+        self._start_session.connect(self._worker.start_session,
+                                    Qt.ConnectionType.QueuedConnection)
+        self._stop_session.connect(self._worker.stop_session,
+                                   Qt.ConnectionType.QueuedConnection)
+        self._worker.new_text_ready.connect(self._on_new_text)
+        self._worker.transcription_finished.connect(self._on_transcription_done)
+        self._worker_thread.start()
+
         # Show loading notification
         self._tray.showMessage(
             "Talki",
@@ -46,12 +84,6 @@ class SpeechInjectorApp(QObject):
             3000,
         )
 
-        # Load transcription model
-        self._transcriber = Transcriber(
-            self._config.model_size,
-            self._config.language,
-        )
-
         # Text injector
         self._text_injector = create_text_injector(self._config.injection_mode)
 
@@ -66,6 +98,45 @@ class SpeechInjectorApp(QObject):
         self._hotkey_manager.toggle_pressed.connect(self._on_toggle_pressed)
         self._hotkey_manager.start()
 
+        # Load the transcription model off the GUI thread; hotkeys are ignored
+        # until it is ready.
+        self._load_model_async()
+
+    def _load_model_async(self):
+        self._transcriber = None
+        model_size = self._config.model_size
+        language = self._config.language
+        compute_type = self._config.compute_type
+
+        def load():
+            try:
+                transcriber = Transcriber(model_size, language, compute_type)
+            except Exception:
+                logger.exception("Failed to load model: %s", model_size)
+                transcriber = None
+            self._model_ready.emit(transcriber)
+
+        QThreadPool.globalInstance().start(load)
+
+    @Slot(object)
+    def _on_model_ready(self, transcriber: Transcriber | None):
+        if transcriber is None:
+            self._tray.showMessage(
+                "Talki",
+                f"Failed to load speech model ({self._config.model_size}).",
+                TrayIcon.MessageIcon.Warning,
+                3000,
+            )
+            return
+        # A newer load was requested while this one was running.
+        if (transcriber.model_size != self._config.model_size or
+                transcriber.compute_type != self._config.compute_type):
+            return
+
+        transcriber.set_language(self._config.language)
+        self._transcriber = transcriber
+        self._worker.set_transcriber(transcriber)
+
         key = self._config.push_to_talk_key
         toggle_key = self._config.toggle_record_key
         self._tray.showMessage(
@@ -77,6 +148,8 @@ class SpeechInjectorApp(QObject):
 
     @Slot()
     def _on_ptt_pressed(self):
+        if self._transcriber is None:
+            return
         self._start_recording_session(source="ptt")
 
     @Slot()
@@ -87,6 +160,8 @@ class SpeechInjectorApp(QObject):
 
     @Slot()
     def _on_toggle_pressed(self):
+        if self._transcriber is None and not self._audio_capture.is_recording:
+            return
         if self._audio_capture.is_recording:
             self._stop_recording_session()
         else:
@@ -98,28 +173,21 @@ class SpeechInjectorApp(QObject):
             return
 
         self._session_source = source
+        self._stream_idle_timer.stop()
         logger.info("Recording started (%s)", source)
         self._tray.set_state(STATE_LISTENING)
 
-        # If a previous worker is still finishing up, stop it and ignore its
-        # outputs. (It may still take time to exit if mid-transcription.)
-        if self._worker is not None:
-            self._worker.request_stop()
-
-        # Start recording (new buffer per session)
-        self._audio_capture = AudioCapture()
+        # Start recording (the capture buffer is reused across sessions)
         self._audio_capture.start_recording(self._config.input_device_id)
 
-        # Start transcription worker
-        worker = TranscriptionWorker(
-            self._transcriber,
+        # A new session id makes any output still pending from the previous
+        # session (e.g. its final pass) stale.
+        self._session_id += 1
+        self._start_session.emit(
             self._audio_capture,
+            self._session_id,
             self._config.transcribe_interval_ms,
         )
-        worker.new_text_ready.connect(self._on_new_text)
-        worker.transcription_finished.connect(self._on_transcription_done)
-        self._worker = worker
-        worker.start()
 
     def _stop_recording_session(self):
         logger.info("Recording stop requested (%s)", self._session_source)
@@ -128,106 +196,118 @@ class SpeechInjectorApp(QObject):
 
         # Stop recording
         self._audio_capture.stop_recording()
+        self._stream_idle_timer.start()
 
         # Signal worker to do final pass and stop
-        if self._worker is not None:
-            self._worker.request_stop()
+        self._stop_session.emit()
 
-    @Slot(str)
-    def _on_new_text(self, text: str):
-        worker = self.sender()
-        if worker is not self._worker:
+    @Slot()
+    def _close_idle_stream(self):
+        if not self._audio_capture.is_recording:
+            logger.info("Closing idle input stream")
+            self._audio_capture.close()
+
+    @Slot(int, int, str)
+    def _on_new_text(self, session_id: int, offset: int, text: str):
+        if session_id != self._session_id:
             return
+        # Coalesce text that queued up while the event loop was busy (e.g. a
+        # regular pass immediately followed by the final pass) into a single
+        # inject() call. The flush is queued behind already-posted texts.
+        if not self._pending_text:
+            QTimer.singleShot(0, self._flush_text)
+        if offset:
+            self._pending_text.append(" ")
+        self._pending_text.append(text)
+
+    def _flush_text(self):
+        text = "".join(self._pending_text)
+        self._pending_text.clear()
         logger.info("Injecting text: %r", text)
-        if self._text_injector is not None:
-            self._text_injector.inject(text)
-
-    @Slot()
-    def _on_transcription_done(self):
-        worker = self.sender()
-        if not isinstance(worker, TranscriptionWorker):
+        injector = self._text_injector
+        if injector is None:
             return
-        logger.info("Transcription finished")
-        # Always join the finished worker to avoid leaking threads.
-        try:
-            worker.wait(5000)
-        except Exception:
-            pass
+        # Typing can block for a while (one synthetic event per character), so
+        # keep it off the GUI thread where the injector allows it.
+        if injector.thread_safe:
+            self._inject_pool.start(partial(injector.inject, text))
+        else:
+            injector.inject(text)
 
+    @Slot(int)
+    def _on_transcription_done(self, session_id: int):
+        logger.info("Transcription finished")
         # Only update UI/state for the currently active session.
-        if worker is self._worker:
+        if session_id == self._session_id:
             self._tray.set_state(STATE_IDLE)
-            self._worker = None
 
     @Slot()
     def _open_settings(self):
-        old_model = self._config.model_size
-        old_key = self._config.push_to_talk_key
-        old_toggle_key = self._config.toggle_record_key
-        old_injection_mode = self._config.injection_mode
+        # The dialog edits the config in place; keep a copy to diff against.
+        old = replace(self._config)
 
         dialog = SettingsDialog(self._config)
         if dialog.exec() != SettingsDialog.DialogCode.Accepted:
             return
 
         self._config = dialog.get_config()
+        if self._config == old:
+            return
 
-        # Reload model if size changed
-        if self._config.model_size != old_model:
+        # Reload model if size or compute type changed
+        model_changed = (self._config.model_size != old.model_size or
+                         self._config.compute_type != old.compute_type)
+        if model_changed:
             self._tray.showMessage(
                 "Talki",
                 f"Loading model ({self._config.model_size})...",
                 TrayIcon.MessageIcon.Information,
                 3000,
             )
-            self._transcriber.load_model(self._config.model_size)
+            self._load_model_async()
 
         # Update language
         if self._transcriber is not None:
             self._transcriber.set_language(self._config.language)
 
-        # Restart hotkey listener if key changed
-        if (self._config.push_to_talk_key != old_key or
-                self._config.toggle_record_key != old_toggle_key):
-            if self._hotkey_manager is not None:
-                self._hotkey_manager.stop()
-            self._hotkey_manager = create_hotkey_manager(
+        # Rebind hotkeys if a key changed
+        if (self._hotkey_manager is not None and
+                (self._config.push_to_talk_key != old.push_to_talk_key or
+                 self._config.toggle_record_key != old.toggle_record_key)):
+            self._hotkey_manager.set_keys(
                 self._config.push_to_talk_key,
                 self._config.toggle_record_key,
-                self,
             )
-            self._hotkey_manager.ptt_pressed.connect(self._on_ptt_pressed)
-            self._hotkey_manager.ptt_released.connect(self._on_ptt_released)
-            self._hotkey_manager.toggle_pressed.connect(self._on_toggle_pressed)
-            self._hotkey_manager.start()
 
         # Restart text injector if mode changed
-        if self._config.injection_mode != old_injection_mode:
+        if self._config.injection_mode != old.injection_mode:
             if self._text_injector is not None:
+                self._inject_pool.waitForDone()
                 self._text_injector.close()
             self._text_injector = create_text_injector(
                 self._config.injection_mode
             )
 
-        self._tray.showMessage(
-            "Talki",
-            "Settings saved.",
-            TrayIcon.MessageIcon.Information,
-            2000,
-        )
+        # A model reload already shows "Loading..." and then "Ready".
+        if not model_changed:
+            self._tray.showMessage(
+                "Talki",
+                "Settings saved.",
+                TrayIcon.MessageIcon.Information,
+                2000,
+            )
 
     @Slot()
     def _quit(self):
         logger.info("Shutting down")
 
-        # Stop recording if active
-        if self._audio_capture.is_recording:
-            self._audio_capture.stop_recording()
+        # Stop recording and release the input device
+        self._audio_capture.close()
 
-        # Stop transcription worker
-        if self._worker is not None:
-            self._worker.request_stop()
-            self._worker.wait(3000)
+        # Stop transcription worker thread
+        if self._worker_thread is not None:
+            self._worker_thread.quit()
+            self._worker_thread.wait(3000)
 
         # Stop hotkey listener
         if self._hotkey_manager is not None:
@@ -235,6 +315,7 @@ class SpeechInjectorApp(QObject):
 
         # Close text injector
         if self._text_injector is not None:
+            self._inject_pool.waitForDone(3000)
             self._text_injector.close()
 
         # Hide tray
@@ -1,20 +1,56 @@
-"""Audio recording via sounddevice with thread-safe buffer management (Talki)."""
+"""Audio recording via sounddevice with lock-free buffer management (Talki)."""
 
-import threading
+import time
+from functools import lru_cache
+from math import gcd
+from typing import TYPE_CHECKING
 
 import numpy as np
-import sounddevice as sd
-from scipy import signal
+
+# sounddevice (PortAudio) and scipy are slow to import, so they are loaded on
+# first use rather than at startup.
+if TYPE_CHECKING:
+    import sounddevice as sd
 
 TARGET_SAMPLE_RATE = 16000
 CHANNELS = 1
 DTYPE = "float32"
 
+# Initial capacity of the capture buffer; it doubles if a session runs longer.
+INITIAL_BUFFER_SECONDS = 60
+
+# Shared result for reads of an empty buffer.
+_EMPTY = np.empty(0, dtype=np.float32)
+_EMPTY.setflags(write=False)
+
+
+# sd.query_devices() enumerates every device through PortAudio, so results
+# are reused for a few seconds.
+DEVICE_CACHE_TTL_S = 5.0
+_devices_cache = None
+_devices_cache_time = 0.0
+
+
+def _get_devices(ttl: float = DEVICE_CACHE_TTL_S):
+    global _devices_cache, _devices_cache_time
+    now = time.monotonic()
+    if _devices_cache is None or now - _devices_cache_time > ttl:
+        import sounddevice as sd
+        _devices_cache = sd.query_devices()
+        _devices_cache_time = now
+    return _devices_cache
+
+
+def invalidate_device_cache():
+    """Force the next device lookup to re-query PortAudio."""
+    global _devices_cache
+    _devices_cache = None
+
 
 def list_input_devices() -> list[dict]:
     """Return list of available input devices."""
     devices = []
-    for i, dev in enumerate(sd.query_devices()):
+    for i, dev in enumerate(_get_devices()):
         if dev["max_input_channels"] > 0:
             devices.append({
                 "id": i,
@@ -27,71 +63,239 @@ def list_input_devices() -> list[dict]:
 
 def get_device_sample_rate(device_id: int | None) -> int:
     if device_id is None:
+        import sounddevice as sd
         device_info = sd.query_devices(kind='input')
     else:
-        device_info = sd.query_devices(device_id)
+        device_info = _get_devices()[device_id]
     return int(device_info["default_samplerate"])
 
 
-def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
-    if orig_sr == target_sr:
-        return audio
-    ratio = target_sr / orig_sr
-    new_length = int(len(audio) * ratio)
-    return signal.resample(audio, new_length).astype(np.float32)
+@lru_cache(maxsize=8)
+def _resample_filter(up: int, down: int) -> np.ndarray:
+    """Anti-aliasing FIR for polyphase resampling, designed once per rate pair."""
+    from scipy import signal
+    # Same design resample_poly uses by default (Kaiser window, beta=5).
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate,
+                         window=("kaiser", 5.0))
+    # float32 taps keep the per-block dot products in float32, so the output
+    # needs no second float64 -> float32 copy.
+    taps = taps.astype(np.float32)
+    taps.setflags(write=False)
+    return taps
+
+
+class StreamResampler:
+    """Polyphase resampler fed one capture block at a time.
+
+    Produces the same samples as scipy.signal.resample_poly() over the whole
+    recording (minus the last few filter-delay samples), carrying only enough
+    input history between blocks to evaluate the FIR.
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int):
+        self.rates = (orig_sr, target_sr)
+        g = gcd(orig_sr, target_sr)
+        self._up, self._down = target_sr // g, orig_sr // g
+        taps = _resample_filter(self._up, self._down) * self._up
+        self._delay = (len(taps) - 1) // 2
+        # Split the FIR into `up` phases of `width` taps each, reversed so a
+        # run of consecutive input samples dots directly with one phase.
+        self._width = width = -(-len(taps) // self._up)
+        padded = np.zeros(width * self._up, dtype=np.float32)
+        padded[:len(taps)] = taps
+        self._phases = np.ascontiguousarray(
+            padded.reshape(width, self._up).T[:, ::-1])
+        self.reset()
+
+    def reset(self):
+        # Samples before the start of the stream are zeros, as for
+        # resample_poly.
+        self._history = np.zeros(self._width - 1, dtype=np.float32)
+        self._history_start = 1 - self._width
+        self._consumed = 0
+        self._produced = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Consume one block of input and return the output it completes."""
+        up, down, delay, width = self._up, self._down, self._delay, self._width
+        x = np.concatenate((self._history, block))
+        self._consumed += len(block)
+
+        # Output m needs input up to (m * down + delay) // up.
+        end = (self._consumed * up - 1 - delay) // down + 1
+        if end <= self._produced:
+            self._history = x
+            return x[:0]
+        t = np.arange(self._produced, end) * down + delay
+        starts = t // up - (width - 1) - self._history_start
+        windows = np.lib.stride_tricks.sliding_window_view(x, width)[starts]
+        out = np.einsum("ij,ij->i", windows, self._phases[t % up])
+        self._produced += len(out)
+
+        # Keep input from the first sample the next output will need.
+        keep_from = (self._produced * down + delay) // up - (width - 1)
+        keep_from = min(keep_from, self._consumed)
+        self._history = x[keep_from - self._history_start:].copy()
+        self._history_start = keep_from
+        return out
+
+
+def _grown(buf: np.ndarray, used: int, min_size: int) -> np.ndarray:
+    # Rare: only when a session outlives the current capacity. The old
+    # samples are copied before the caller publishes the new buffer.
+    grown = np.empty(max(len(buf) * 2, min_size), dtype=np.float32)
+    grown[:used] = buf[:used]
+    return grown
 
 
 class AudioCapture:
+    """Records into pre-allocated buffers that are reused across sessions.
+
+    Only TARGET_SAMPLE_RATE audio is stored: when the device runs at another
+    rate, each block is resampled as it arrives and the device-rate samples
+    are dropped.
+    """
+
     def __init__(self):
         self._stream: sd.InputStream | None = None
-        self._chunks: list[np.ndarray] = []
-        self._lock = threading.Lock()
+        self._device_id: int | None = None
+        self._buf = np.empty(TARGET_SAMPLE_RATE * INITIAL_BUFFER_SECONDS,
+                             dtype=np.float32)
+        self._write_idx = 0
+        self._resampler: StreamResampler | None = None
+        # Bumped on every reset so a reader still holding an index into the
+        # previous session can tell the buffer was reused under it.
+        self._generation = 0
         self._recording = False
         self._sample_rate: int = TARGET_SAMPLE_RATE
 
     def _audio_callback(self, indata: np.ndarray, frames: int,
                         time_info, status):
+        if not self._recording:
+            return
         if status:
             pass
-        with self._lock:
-            self._chunks.append(indata.copy())
+        # Single producer: write the samples first, then publish the new end
+        # index. The int assignment is atomic under the GIL, so readers never
+        # see an index past the data written so far and no lock is needed.
+        # With CHANNELS == 1 the (frames, 1) block reshapes to a flat view of
+        # the same memory; no per-callback copy is made.
+        samples = indata.reshape(-1)
+        if self._resampler is not None:
+            samples = self._resampler.process(samples)
+        n = len(samples)
+        w = self._write_idx
+        if w + n > len(self._buf):
+            self._buf = _grown(self._buf, w, w + n)
+        self._buf[w:w + n] = samples
+        self._write_idx = w + n
 
     def start_recording(self, device_id: int | None = None):
-        self.clear_buffer()
+        # The stream stays open between sessions; it is only reopened when
+        # the device changes or PortAudio stopped it (e.g. device unplugged).
+        stream = self._stream
+        if stream is None or not stream.active or device_id != self._device_id:
+            self._open_stream(device_id)
+        else:
+            # Gating _recording off is not enough to reset safely: a callback
+            # that already passed the check could still publish its write
+            # index afterwards. Stopping the stream waits for it to finish.
+            stream.stop()
+            self._reset()
+            stream.start()
         self._recording = True
+
+    def _open_stream(self, device_id: int | None):
+        import sounddevice as sd
+        self.close()
+        self._reset()
         self._sample_rate = get_device_sample_rate(device_id)
-        self._stream = sd.InputStream(
-            samplerate=self._sample_rate,
-            channels=CHANNELS,
-            dtype=DTYPE,
-            device=device_id,
-            callback=self._audio_callback,
-        )
-        self._stream.start()
+        if self._sample_rate == TARGET_SAMPLE_RATE:
+            self._resampler = None
+        elif (self._resampler is None or
+              self._resampler.rates != (self._sample_rate, TARGET_SAMPLE_RATE)):
+            self._resampler = StreamResampler(self._sample_rate,
+                                              TARGET_SAMPLE_RATE)
+        try:
+            self._stream = sd.InputStream(
+                samplerate=self._sample_rate,
+                channels=CHANNELS,
+                dtype=DTYPE,
+                device=device_id,
+                callback=self._audio_callback,
+            )
+            self._stream.start()
+        except sd.PortAudioError:
+            # The cached device list may be stale (e.g. device unplugged).
+            self._stream = None
+            invalidate_device_cache()
+            raise
+        self._device_id = device_id
 
     @property
-    def sample_rate(self) -> int:
-        return self._sample_rate
+    def samples_recorded(self) -> int:
+        """Number of TARGET_SAMPLE_RATE samples in the current session."""
+        return self._write_idx
 
     def get_buffer(self) -> np.ndarray:
-        """Return a copy of the current audio buffer for transcription."""
-        with self._lock:
-            if not self._chunks:
-                return np.array([], dtype=np.float32)
-            return np.concatenate(self._chunks, axis=0).flatten()
+        """Return the current audio at TARGET_SAMPLE_RATE as a read-only view.
+
+        No copy is made. The samples stay valid while recording continues
+        (the callback only appends past them), but the next session reuses
+        the buffer: copy the view if it must outlive start_recording().
+        """
+        # Read the index before the buffer: a concurrent grow publishes the
+        # new buffer with every sample up to that index already copied.
+        end = self._write_idx
+        if end == 0:
+            return _EMPTY
+        view = self._buf[:end]
+        view.flags.writeable = False
+        return view
+
+    def read_new(self, last_idx: int) -> tuple[np.ndarray, int]:
+        """Return TARGET_SAMPLE_RATE samples recorded since ``last_idx``.
+
+        Also returns the new end index. The samples are a read-only view
+        into the capture buffer; copy them out before the next session starts.
+        """
+        end = self._write_idx
+        view = self._buf[last_idx:end]
+        view.flags.writeable = False
+        return view, end
 
     def stop_recording(self) -> np.ndarray:
-        """Stop recording and return the final complete buffer."""
+        """Stop recording and return the final complete buffer.
+
+        The input stream is kept open for the next session; call close()
+        to release the device.
+        """
+        self._recording = False
+        return self.get_buffer()
+
+    def close(self):
+        """Stop recording and close the input stream."""
         self._recording = False
         if self._stream is not None:
             self._stream.stop()
             self._stream.close()
             self._stream = None
-        return self.get_buffer()
+        self._device_id = None
+
+    @property
+    def generation(self) -> int:
+        return self._generation
 
-    def clear_buffer(self):
-        with self._lock:
-            self._chunks.clear()
+    def _reset(self):
+        # Only the callback writes these, so the stream must be stopped or
+        # closed while they are reset.
+        assert not self._recording
+        self._generation += 1
+        self._write_idx = 0
+        if self._resampler is not None:
+            self._resampler.reset()
 
     @property
     def is_recording(self) -> bool:
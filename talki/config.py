@@ -1,8 +1,10 @@
 """JSON-based persistent settings for Talki."""
 
 import json
+import os
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
+from typing import ClassVar
 
 from .platform_utils import get_config_dir
 
@@ -13,6 +15,7 @@ class Config:
     push_to_talk_key: str = "F9"
     toggle_record_key: str = "F10"
     model_size: str = "base"
+    compute_type: str = "auto"
     language: str = "en"
     injection_mode: str = "auto"
     transcribe_interval_ms: int = 1500
@@ -23,18 +26,32 @@ class Config:
         if self._path is None:
             self._path = get_config_dir() / "config.json"
 
+    # Last parsed config.json as ((path, mtime_ns, size), data); lets repeated
+    # load() calls skip re-reading an unchanged file.
+    _load_cache: ClassVar[tuple | None] = None
+
     @classmethod
     def load(cls) -> "Config":
         path = get_config_dir() / "config.json"
-        if path.exists():
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+        if st is not None:
+            key = (path, st.st_mtime_ns, st.st_size)
             try:
-                data = json.loads(path.read_text())
+                if cls._load_cache is not None and cls._load_cache[0] == key:
+                    data = dict(cls._load_cache[1])
+                else:
+                    with path.open("rb") as f:
+                        data = json.load(f)
+                    cls._load_cache = (key, dict(data))
                 data.pop("_path", None)
                 cfg = cls(**{k: v for k, v in data.items()
                              if k in cls.__dataclass_fields__})
                 cfg._path = path
                 return cfg
-            except (json.JSONDecodeError, TypeError):
+            except (json.JSONDecodeError, TypeError, ValueError):
                 pass
         cfg = cls()
         cfg._path = path
@@ -44,5 +61,14 @@ class Config:
     def save(self):
         data = asdict(self)
         data.pop("_path", None)
+        new = json.dumps(data, indent=2)
+        try:
+            if self._path.read_bytes() == new.encode():
+                return
+        except OSError:
+            pass
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._path.write_text(json.dumps(data, indent=2))
+        # Write to a temp file and rename so a crash never leaves truncated JSON.
+        tmp = self._path.with_suffix(".json.tmp")
+        tmp.write_text(new)
+        os.replace(tmp, self._path)
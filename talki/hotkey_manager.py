@@ -7,16 +7,128 @@ Fallback: pynput listener (if needed).
 """
 
 import logging
+import os
+import queue
+import select
+import struct
 import threading
+from functools import lru_cache
 
-from PySide6.QtCore import QObject, Signal, Slot, QMetaObject, Qt
+from PySide6.QtCore import QObject, Signal
 
 from .platform_utils import get_platform, get_evdev_keyboard_devices
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _get_ecodes():
+    import evdev.ecodes
+    return evdev.ecodes
+
+
+# struct input_event: struct timeval time; __u16 type; __u16 code; __s32 value.
+_INPUT_EVENT = struct.Struct("llHHi")
+
+# Key names -> evdev ecode names, beyond the direct "KEY_" + NAME mapping.
+_EVDEV_SPECIAL = {
+    "ctrl": "KEY_LEFTCTRL",
+    "alt": "KEY_LEFTALT",
+    "shift": "KEY_LEFTSHIFT",
+    "space": "KEY_SPACE",
+    "enter": "KEY_ENTER",
+    "tab": "KEY_TAB",
+    "escape": "KEY_ESC",
+    "esc": "KEY_ESC",
+    "backspace": "KEY_BACKSPACE",
+    "capslock": "KEY_CAPSLOCK",
+    "caps_lock": "KEY_CAPSLOCK",
+    "grave": "KEY_GRAVE",
+    "backquote": "KEY_GRAVE",
+    "minus": "KEY_MINUS",
+    "equal": "KEY_EQUAL",
+    "bracket_left": "KEY_LEFTBRACE",
+    "bracket_right": "KEY_RIGHTBRACE",
+    "backslash": "KEY_BACKSLASH",
+    "semicolon": "KEY_SEMICOLON",
+    "apostrophe": "KEY_APOSTROPHE",
+    "comma": "KEY_COMMA",
+    "period": "KEY_DOT",
+    "dot": "KEY_DOT",
+    "slash": "KEY_SLASH",
+}
+
+# Key names -> Windows virtual-key codes, beyond letters, digits and F-keys.
+_WIN_SPECIAL = {
+    "space": 0x20,
+    "tab": 0x09,
+    "enter": 0x0D,
+    "return": 0x0D,
+    "escape": 0x1B,
+    "esc": 0x1B,
+    "backspace": 0x08,
+    "capslock": 0x14,
+    "caps_lock": 0x14,
+
+    # OEM keys (US layout)
+    "grave": 0xC0,       # ` ~
+    "backquote": 0xC0,
+    "minus": 0xBD,       # - _
+    "equal": 0xBB,       # = +
+    "bracket_left": 0xDB,   # [ {
+    "bracket_right": 0xDD,  # ] }
+    "backslash": 0xDC,   # \ |
+    "semicolon": 0xBA,   # ; :
+    "apostrophe": 0xDE,  # ' "
+    "comma": 0xBC,       # , <
+    "period": 0xBE,      # . >
+    "dot": 0xBE,
+    "slash": 0xBF,       # / ?
+}
+
+# Apple virtual key codes for function keys.
+_MAC_FKEYS = {
+    "f1": 122, "f2": 120, "f3": 99, "f4": 118,
+    "f5": 96, "f6": 97, "f7": 98, "f8": 100,
+    "f9": 101, "f10": 109, "f11": 103, "f12": 111,
+    "f13": 105, "f14": 107, "f15": 113, "f16": 106,
+    "f17": 64, "f18": 79, "f19": 80, "f20": 90,
+}
+
+# Apple virtual key codes for the main block (US layout).
+_MAC_LETTERS = {
+    "a": 0, "s": 1, "d": 2, "f": 3, "h": 4, "g": 5, "z": 6, "x": 7,
+    "c": 8, "v": 9, "b": 11, "q": 12, "w": 13, "e": 14, "r": 15,
+    "y": 16, "t": 17, "1": 18, "2": 19, "3": 20, "4": 21, "6": 22,
+    "5": 23, "=": 24, "9": 25, "7": 26, "-": 27, "8": 28, "0": 29,
+    "]": 30, "o": 31, "u": 32, "[": 33, "i": 34, "p": 35, "enter": 36,
+    "l": 37, "j": 38, "'": 39, "k": 40, ";": 41, "\\": 42, ",": 43,
+    "/": 44, "n": 45, "m": 46, ".": 47, "tab": 48, "space": 49,
+    "grave": 50, "backspace": 51, "esc": 53, "escape": 53, "capslock": 57,
+}
+
+# Apple virtual key codes for the canonical key names used in this project.
+_MAC_SPECIAL = {
+    "return": 36,
+    "caps_lock": 57,
+    "backquote": 50,
+    "minus": 27,
+    "equal": 24,
+    "bracket_left": 33,
+    "bracket_right": 30,
+    "backslash": 42,
+    "semicolon": 41,
+    "apostrophe": 39,
+    "comma": 43,
+    "period": 47,
+    "dot": 47,
+    "slash": 44,
+}
+
+
 class BaseHotkeyManager(QObject):
+    # Emitted from the listener thread; connections to GUI-thread receivers
+    # are queued automatically.
     ptt_pressed = Signal()
     ptt_released = Signal()
     toggle_pressed = Signal()
@@ -30,6 +142,9 @@ class BaseHotkeyManager(QObject):
         super().__init__(parent)
         self._ptt_key_name = ptt_key_name
         self._toggle_key_name = toggle_key_name or ""
+        # Edge state, flipped only by the thread that handles key events.
+        # Plain attributes: a bool store is atomic under the GIL and cheaper
+        # than any ctypes/array-backed alternative.
         self._ptt_is_down = False
         self._toggle_is_down = False
 
@@ -40,8 +155,17 @@ class BaseHotkeyManager(QObject):
         raise NotImplementedError
 
     def set_keys(self, ptt_key_name: str, toggle_key_name: str | None = None):
+        """Switch to new hotkeys.
+
+        Subclasses that can rebind a running listener override this; the
+        default restarts the listener.
+        """
+        self.stop()
         self._ptt_key_name = ptt_key_name
         self._toggle_key_name = toggle_key_name or ""
+        self._ptt_is_down = False
+        self._toggle_is_down = False
+        self.start()
 
 
 class EvdevHotkeyManager(BaseHotkeyManager):
@@ -56,13 +180,17 @@ class EvdevHotkeyManager(BaseHotkeyManager):
         self._thread: threading.Thread | None = None
         self._running = False
         self._devices = []
-        self._grabbed_device_paths: set[str] = set()
+        self._grabbed_fds: set[int] = set()
         self._uinput = None
+        # Key code -> "ptt" / "toggle"; swapped as a whole on rebind.
+        self._hotkeys: dict[int, str] = {}
 
-    def _key_name_to_code(self, key_name: str) -> int | None:
-        import evdev.ecodes as ecodes
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _key_name_to_code(key_name: str) -> int | None:
         if not key_name:
             return None
+        ecodes = _get_ecodes()
         # Try direct mapping: "F9" -> "KEY_F9"
         ecode_name = "KEY_" + key_name.upper()
         code = getattr(ecodes, ecode_name, None)
@@ -73,42 +201,44 @@ class EvdevHotkeyManager(BaseHotkeyManager):
         if code is not None:
             return code
         # Handle special names
-        special = {
-            "ctrl": "KEY_LEFTCTRL",
-            "alt": "KEY_LEFTALT",
-            "shift": "KEY_LEFTSHIFT",
-            "space": "KEY_SPACE",
-            "enter": "KEY_ENTER",
-            "tab": "KEY_TAB",
-            "escape": "KEY_ESC",
-            "esc": "KEY_ESC",
-            "backspace": "KEY_BACKSPACE",
-            "capslock": "KEY_CAPSLOCK",
-            "caps_lock": "KEY_CAPSLOCK",
-            "grave": "KEY_GRAVE",
-            "backquote": "KEY_GRAVE",
-            "minus": "KEY_MINUS",
-            "equal": "KEY_EQUAL",
-            "bracket_left": "KEY_LEFTBRACE",
-            "bracket_right": "KEY_RIGHTBRACE",
-            "backslash": "KEY_BACKSLASH",
-            "semicolon": "KEY_SEMICOLON",
-            "apostrophe": "KEY_APOSTROPHE",
-            "comma": "KEY_COMMA",
-            "period": "KEY_DOT",
-            "dot": "KEY_DOT",
-            "slash": "KEY_SLASH",
-        }
-        mapped = special.get(key_name.lower())
+        mapped = _EVDEV_SPECIAL.get(key_name.lower())
         if mapped:
             return getattr(ecodes, mapped, None)
         return None
 
+    def _resolve_keys(self) -> bool:
+        ptt_code = self._key_name_to_code(self._ptt_key_name)
+        if ptt_code is None:
+            logger.error("Unknown push-to-talk key name: %s", self._ptt_key_name)
+        toggle_code = self._key_name_to_code(self._toggle_key_name)
+        hotkeys = {}
+        if toggle_code is not None:
+            hotkeys[toggle_code] = "toggle"
+        if ptt_code is not None:
+            hotkeys[ptt_code] = "ptt"
+        self._hotkeys = hotkeys
+        return ptt_code is not None
+
+    def set_keys(self, ptt_key_name: str, toggle_key_name: str | None = None):
+        # The listener picks up the new mapping, so no restart is needed.
+        self._ptt_is_down = False
+        self._toggle_is_down = False
+        self._ptt_key_name = ptt_key_name
+        self._toggle_key_name = toggle_key_name or ""
+        if self._thread is None:
+            # start() bailed out earlier (unknown key or no keyboards found),
+            # so nothing is listening yet.
+            self.start()
+        else:
+            self._resolve_keys()
+
     def start(self):
         import evdev
         from evdev import UInput
+        if not self._resolve_keys():
+            return
         self._running = True
-        self._grabbed_device_paths.clear()
+        self._grabbed_fds.clear()
         device_paths = get_evdev_keyboard_devices()
         if not device_paths:
             logger.error("No keyboard devices found. Is user in 'input' group?")
@@ -118,14 +248,11 @@ class EvdevHotkeyManager(BaseHotkeyManager):
         
         combined_caps = {}
         for dev in self._devices:
-            for etype, ecodes_list in dev.capabilities().items():
+            # absinfo=False yields plain codes for every event type.
+            for etype, codes in dev.capabilities(absinfo=False).items():
                 if etype == 0:
                     continue
-                if etype not in combined_caps:
-                    combined_caps[etype] = set()
-                for item in ecodes_list:
-                    code = item[0] if isinstance(item, tuple) else item
-                    combined_caps[etype].add(code)
+                combined_caps.setdefault(etype, set()).update(codes)
         combined_caps = {k: list(v) for k, v in combined_caps.items()}
         
         self._uinput = UInput(combined_caps, name="talki-kbd")
@@ -133,72 +260,97 @@ class EvdevHotkeyManager(BaseHotkeyManager):
         for dev in self._devices:
             try:
                 dev.grab()
-                self._grabbed_device_paths.add(dev.path)
+                self._grabbed_fds.add(dev.fd)
             except IOError as e:
                 logger.warning("Could not grab %s: %s", dev.path, e)
-        if not self._grabbed_device_paths:
+        if not self._grabbed_fds:
             logger.warning(
                 "Could not grab any keyboard devices; push-to-talk key will not be suppressed."
             )
+            # Observation only: nothing will ever be re-emitted.
+            self._uinput.close()
+            self._uinput = None
         
         self._thread = threading.Thread(target=self._listener_loop, daemon=True)
         self._thread.start()
 
     def _listener_loop(self):
-        import selectors
-        import evdev
-
-        ptt_code = self._key_name_to_code(self._ptt_key_name)
-        if ptt_code is None:
-            logger.error("Unknown push-to-talk key name: %s", self._ptt_key_name)
-            return
-
-        toggle_code = self._key_name_to_code(self._toggle_key_name)
-
-        sel = selectors.DefaultSelector()
+        # Only read readiness on a fixed set of fds is needed, so use epoll
+        # directly rather than through the selectors wrapper.
+        ep = select.epoll()
         for dev in self._devices:
-            sel.register(dev, selectors.EVENT_READ)
-
+            os.set_blocking(dev.fd, False)
+            ep.register(dev.fd, select.EPOLLIN)
+
+        # Bound once: the loop below runs for every input event.
+        EV_KEY = _get_ecodes().EV_KEY
+        uinput_fd = self._uinput.fd if self._uinput is not None else None
+        grabbed_fds = self._grabbed_fds
+        event_size = _INPUT_EVENT.size
+        read_size = event_size * 64
+        iter_unpack = _INPUT_EVENT.iter_unpack
+        read = os.read
+        write = os.write
+
+        # A short timeout keeps stop() responsive; the devices are drained
+        # completely on each wakeup so bursts don't cost a select per read.
         while self._running:
-            for key, _mask in sel.select(timeout=0.5):
-                device = key.fileobj
+            for fd, _mask in ep.poll(0.05):
+                hotkeys = self._hotkeys
+                forward = uinput_fd is not None and fd in grabbed_fds
                 try:
-                    for event in device.read():
-                        is_key_event = event.type == evdev.ecodes.EV_KEY
-                        is_ptt_key = is_key_event and event.code == ptt_code
-                        is_toggle_key = (
-                            toggle_code is not None and is_key_event and event.code == toggle_code
-                        )
-                        
-                        if is_ptt_key:
-                            if event.value == 1 and not self._ptt_is_down:
-                                self._ptt_is_down = True
-                                QMetaObject.invokeMethod(
-                                    self, "_emit_pressed",
-                                    Qt.ConnectionType.QueuedConnection,
-                                )
-                            elif event.value == 0 and self._ptt_is_down:
-                                self._ptt_is_down = False
-                                QMetaObject.invokeMethod(
-                                    self, "_emit_released",
-                                    Qt.ConnectionType.QueuedConnection,
-                                )
-                        elif is_toggle_key:
-                            if event.value == 1 and not self._toggle_is_down:
+                    # The fds are non-blocking: read until the kernel queue is
+                    # empty. Events are unpacked straight from the raw
+                    # struct input_event records rather than wrapped as
+                    # InputEvent objects.
+                    while True:
+                        data = read(fd, read_size)
+                        if not data:
+                            break
+                        # Pass-through events are forwarded as the original
+                        # bytes in one write per read; only the hotkey records
+                        # are cut out. The source's own SYN_REPORTs travel in
+                        # the batch, so uinput sees exactly one syn per source
+                        # packet and frames are never merged or split.
+                        chunks = []
+                        keep_from = 0
+                        offset = 0
+                        for _sec, _usec, etype, code, value in iter_unpack(data):
+                            kind = hotkeys.get(code) if etype == EV_KEY else None
+                            offset += event_size
+                            if kind is None:
+                                continue
+                            if forward:
+                                chunks.append(data[keep_from:offset - event_size])
+                                keep_from = offset
+                            if value == 2:
+                                # Autorepeat of a held hotkey: dropped, only
+                                # press/release edges matter.
+                                continue
+                            if kind == "ptt":
+                                if value == 1 and not self._ptt_is_down:
+                                    self._ptt_is_down = True
+                                    self.ptt_pressed.emit()
+                                elif value == 0 and self._ptt_is_down:
+                                    self._ptt_is_down = False
+                                    self.ptt_released.emit()
+                            elif value == 1 and not self._toggle_is_down:
                                 self._toggle_is_down = True
-                                QMetaObject.invokeMethod(
-                                    self, "_emit_toggle",
-                                    Qt.ConnectionType.QueuedConnection,
-                                )
-                            elif event.value == 0 and self._toggle_is_down:
+                                self.toggle_pressed.emit()
+                            elif value == 0 and self._toggle_is_down:
                                 self._toggle_is_down = False
-                        elif (self._uinput is not None and
-                              device.path in self._grabbed_device_paths):
-                            self._uinput.write_event(event)
+                        if forward:
+                            if keep_from:
+                                chunks.append(data[keep_from:])
+                                data = b"".join(chunks)
+                            if data:
+                                write(uinput_fd, data)
+                except BlockingIOError:
+                    continue
                 except OSError:
                     continue
 
-        sel.close()
+        ep.close()
         for dev in self._devices:
             try:
                 dev.ungrab()
@@ -209,18 +361,6 @@ class EvdevHotkeyManager(BaseHotkeyManager):
             except Exception:
                 pass
 
-    @Slot()
-    def _emit_pressed(self):
-        self.ptt_pressed.emit()
-
-    @Slot()
-    def _emit_released(self):
-        self.ptt_released.emit()
-
-    @Slot()
-    def _emit_toggle(self):
-        self.toggle_pressed.emit()
-
     def stop(self):
         self._running = False
         if self._thread is not None:
@@ -255,8 +395,12 @@ class WindowsHotkeyManager(BaseHotkeyManager):
         self._thread_id: int | None = None
         self._ptt_vk: int | None = None
         self._toggle_vk: int | None = None
+        # Hotkey edges queued by the hook and handled on _dispatch_thread.
+        self._key_events: queue.SimpleQueue | None = None
+        self._dispatch_thread: threading.Thread | None = None
 
     @staticmethod
+    @lru_cache(maxsize=128)
     def _key_name_to_vk(key_name: str) -> int | None:
         if not key_name:
             return None
@@ -268,34 +412,8 @@ class WindowsHotkeyManager(BaseHotkeyManager):
             return ord(name)
 
         # Common named keys
-        special = {
-            "space": 0x20,
-            "tab": 0x09,
-            "enter": 0x0D,
-            "return": 0x0D,
-            "escape": 0x1B,
-            "esc": 0x1B,
-            "backspace": 0x08,
-            "capslock": 0x14,
-            "caps_lock": 0x14,
-
-            # OEM keys (US layout)
-            "grave": 0xC0,       # ` ~
-            "backquote": 0xC0,
-            "minus": 0xBD,       # - _
-            "equal": 0xBB,       # = +
-            "bracket_left": 0xDB,   # [ {
-            "bracket_right": 0xDD,  # ] }
-            "backslash": 0xDC,   # \ |
-            "semicolon": 0xBA,   # ; :
-            "apostrophe": 0xDE,  # ' "
-            "comma": 0xBC,       # , <
-            "period": 0xBE,      # . >
-            "dot": 0xBE,
-            "slash": 0xBF,       # / ?
-        }
-        if name in special:
-            return special[name]
+        if name in _WIN_SPECIAL:
+            return _WIN_SPECIAL[name]
 
         # Function keys
         if name.startswith("f") and name[1:].isdigit():
@@ -305,6 +423,26 @@ class WindowsHotkeyManager(BaseHotkeyManager):
 
         return None
 
+    def set_keys(self, ptt_key_name: str, toggle_key_name: str | None = None):
+        # The hook compares against the current codes on every event.
+        ptt_vk = self._key_name_to_vk(ptt_key_name)
+        if ptt_vk is None:
+            logger.error("Unknown push-to-talk key name for Windows: %s", ptt_key_name)
+        self._ptt_is_down = False
+        self._toggle_is_down = False
+        self._ptt_key_name = ptt_key_name
+        self._toggle_key_name = toggle_key_name or ""
+        self._ptt_vk = ptt_vk
+        self._toggle_vk = self._key_name_to_vk(self._toggle_key_name)
+        # start() bailed out earlier (e.g. on an unknown key), or the hook
+        # thread gave up: nothing is listening yet.
+        # stop() also retires the dead hook thread's dispatch thread, which
+        # would otherwise wait forever on a queue nobody feeds.
+        if self._thread is not None and not self._thread.is_alive():
+            self.stop()
+        if self._thread is None:
+            self.start()
+
     def start(self):
         import ctypes
         from ctypes import wintypes
@@ -352,42 +490,52 @@ class WindowsHotkeyManager(BaseHotkeyManager):
             wintypes.LPARAM,
         )
 
+        # Bound once: the OS drops the hook if it runs too long per event.
+        down_msgs = (WM_KEYDOWN, WM_SYSKEYDOWN)
+        up_msgs = (WM_KEYUP, WM_SYSKEYUP)
+        from_address = KBDLLHOOKSTRUCT.from_address
+        call_next_hook = user32.CallNextHookEx
+
+        # The hook runs inside the system input pipeline, so it only
+        # classifies the event and queues hotkey edges; state changes and
+        # signal emission happen on the dispatch thread.
+        key_events = queue.SimpleQueue()
+        put = key_events.put
+
         def hook_proc(n_code, w_param, l_param):
             if n_code == HC_ACTION and self._running:
-                msg = int(w_param)
-                is_down = msg in (WM_KEYDOWN, WM_SYSKEYDOWN)
-                is_up = msg in (WM_KEYUP, WM_SYSKEYUP)
+                # LPARAM arrives as a plain int: map the struct in place
+                # instead of building a pointer object per keystroke.
+                vk = from_address(l_param).vkCode
+                if vk == self._ptt_vk or vk == self._toggle_vk:
+                    if w_param in down_msgs:
+                        put((vk, True))
+                    elif w_param in up_msgs:
+                        put((vk, False))
+                    return 1
 
-                info = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
-                vk = int(info.vkCode)
+            return call_next_hook(self._hook, n_code, w_param, l_param)
 
+        def dispatch_main():
+            get = key_events.get
+            while True:
+                item = get()
+                if item is None:
+                    break
+                vk, is_down = item
                 if vk == self._ptt_vk:
                     if is_down and not self._ptt_is_down:
                         self._ptt_is_down = True
-                        QMetaObject.invokeMethod(
-                            self, "_emit_pressed",
-                            Qt.ConnectionType.QueuedConnection,
-                        )
-                    elif is_up and self._ptt_is_down:
+                        self.ptt_pressed.emit()
+                    elif not is_down and self._ptt_is_down:
                         self._ptt_is_down = False
-                        QMetaObject.invokeMethod(
-                            self, "_emit_released",
-                            Qt.ConnectionType.QueuedConnection,
-                        )
-                    return 1
-
-                if self._toggle_vk is not None and vk == self._toggle_vk:
+                        self.ptt_released.emit()
+                elif vk == self._toggle_vk:
                     if is_down and not self._toggle_is_down:
                         self._toggle_is_down = True
-                        QMetaObject.invokeMethod(
-                            self, "_emit_toggle",
-                            Qt.ConnectionType.QueuedConnection,
-                        )
-                    elif is_up and self._toggle_is_down:
+                        self.toggle_pressed.emit()
+                    elif not is_down and self._toggle_is_down:
                         self._toggle_is_down = False
-                    return 1
-
-            return user32.CallNextHookEx(self._hook, n_code, w_param, l_param)
 
         self._hook_proc = LowLevelKeyboardProc(hook_proc)
 
@@ -423,21 +571,12 @@ class WindowsHotkeyManager(BaseHotkeyManager):
                 user32.UnhookWindowsHookEx(self._hook)
                 self._hook = None
 
+        self._key_events = key_events
+        self._dispatch_thread = threading.Thread(target=dispatch_main, daemon=True)
+        self._dispatch_thread.start()
         self._thread = threading.Thread(target=thread_main, daemon=True)
         self._thread.start()
 
-    @Slot()
-    def _emit_pressed(self):
-        self.ptt_pressed.emit()
-
-    @Slot()
-    def _emit_released(self):
-        self.ptt_released.emit()
-
-    @Slot()
-    def _emit_toggle(self):
-        self.toggle_pressed.emit()
-
     def stop(self):
         self._running = False
         if self._user32 is not None and self._thread_id is not None:
@@ -450,6 +589,12 @@ class WindowsHotkeyManager(BaseHotkeyManager):
             self._thread.join(timeout=2.0)
             self._thread = None
         self._hook_proc = None
+        if self._key_events is not None:
+            self._key_events.put(None)
+            self._key_events = None
+        if self._dispatch_thread is not None:
+            self._dispatch_thread.join(timeout=2.0)
+            self._dispatch_thread = None
 
 
 class MacHotkeyManager(BaseHotkeyManager):
@@ -467,63 +612,50 @@ class MacHotkeyManager(BaseHotkeyManager):
 
         self._event_tap = None
         self._tap_callback = None
+        self._run_loop = None
         self._ptt_keycode: int | None = None
         self._toggle_keycode: int | None = None
 
     @staticmethod
+    @lru_cache(maxsize=128)
     def _key_name_to_keycode(key_name: str) -> int | None:
         if not key_name:
             return None
         name = key_name.lower()
 
         # Function keys (Apple virtual key codes)
-        fkeys = {
-            "f1": 122, "f2": 120, "f3": 99, "f4": 118,
-            "f5": 96, "f6": 97, "f7": 98, "f8": 100,
-            "f9": 101, "f10": 109, "f11": 103, "f12": 111,
-            "f13": 105, "f14": 107, "f15": 113, "f16": 106,
-            "f17": 64, "f18": 79, "f19": 80, "f20": 90,
-        }
-        if name in fkeys:
-            return fkeys[name]
+        if name in _MAC_FKEYS:
+            return _MAC_FKEYS[name]
 
         # Letters (US layout)
-        letters = {
-            "a": 0, "s": 1, "d": 2, "f": 3, "h": 4, "g": 5, "z": 6, "x": 7,
-            "c": 8, "v": 9, "b": 11, "q": 12, "w": 13, "e": 14, "r": 15,
-            "y": 16, "t": 17, "1": 18, "2": 19, "3": 20, "4": 21, "6": 22,
-            "5": 23, "=": 24, "9": 25, "7": 26, "-": 27, "8": 28, "0": 29,
-            "]": 30, "o": 31, "u": 32, "[": 33, "i": 34, "p": 35, "enter": 36,
-            "l": 37, "j": 38, "'": 39, "k": 40, ";": 41, "\\": 42, ",": 43,
-            "/": 44, "n": 45, "m": 46, ".": 47, "tab": 48, "space": 49,
-            "grave": 50, "backspace": 51, "esc": 53, "escape": 53, "capslock": 57,
-        }
-        if name in letters:
-            return letters[name]
+        if name in _MAC_LETTERS:
+            return _MAC_LETTERS[name]
 
         # Canonical names used in this project (preferred)
-        special = {
-            "return": 36,
-            "caps_lock": 57,
-            "backquote": 50,
-            "minus": 27,
-            "equal": 24,
-            "bracket_left": 33,
-            "bracket_right": 30,
-            "backslash": 42,
-            "semicolon": 41,
-            "apostrophe": 39,
-            "comma": 43,
-            "period": 47,
-            "dot": 47,
-            "slash": 44,
-        }
-        if name in special:
-            return special[name]
+        if name in _MAC_SPECIAL:
+            return _MAC_SPECIAL[name]
 
         # Single-character fallback for letters/digits already handled above.
         return None
 
+    def set_keys(self, ptt_key_name: str, toggle_key_name: str | None = None):
+        # The tap compares against the current codes on every event.
+        keycode = self._key_name_to_keycode(ptt_key_name)
+        if keycode is None:
+            logger.error("Unknown push-to-talk key name for macOS: %s", ptt_key_name)
+        self._ptt_is_down = False
+        self._toggle_is_down = False
+        self._ptt_key_name = ptt_key_name
+        self._toggle_key_name = toggle_key_name or ""
+        self._ptt_keycode = keycode
+        self._toggle_keycode = self._key_name_to_keycode(self._toggle_key_name)
+        # start() bailed out earlier (e.g. on an unknown key), or the tap
+        # thread gave up: nothing is listening yet.
+        if self._thread is not None and not self._thread.is_alive():
+            self._thread = None
+        if self._thread is None:
+            self.start()
+
     def start(self):
         if self._thread is not None:
             return
@@ -557,53 +689,45 @@ class MacHotkeyManager(BaseHotkeyManager):
             kCGEventTapDisabledByUserInput = getattr(
                 Quartz, "kCGEventTapDisabledByUserInput", None
             )
+            # Bound once: the tap sits in the system event pipeline.
+            get_field = Quartz.CGEventGetIntegerValueField
+            keycode_field = Quartz.kCGKeyboardEventKeycode
+            tap_disabled = tuple(
+                t for t in (kCGEventTapDisabledByTimeout, kCGEventTapDisabledByUserInput)
+                if t is not None
+            )
 
             def tap_callback(proxy, type_, event, refcon):
-                if not self._running:
-                    return event
+                # Key events first: they are nearly everything the tap sees.
+                if type_ == kCGEventKeyDown or type_ == kCGEventKeyUp:
+                    if not self._running:
+                        return event
+                    code = get_field(event, keycode_field)
+                    is_down = type_ == kCGEventKeyDown
+
+                    # Unset keycodes are None and never match.
+                    if code == self._ptt_keycode:
+                        if is_down and not self._ptt_is_down:
+                            self._ptt_is_down = True
+                            self.ptt_pressed.emit()
+                        elif not is_down and self._ptt_is_down:
+                            self._ptt_is_down = False
+                            self.ptt_released.emit()
+                        return None
+
+                    if code == self._toggle_keycode:
+                        if is_down and not self._toggle_is_down:
+                            self._toggle_is_down = True
+                            self.toggle_pressed.emit()
+                        elif not is_down and self._toggle_is_down:
+                            self._toggle_is_down = False
+                        return None
 
-                if kCGEventTapDisabledByTimeout is not None and type_ == kCGEventTapDisabledByTimeout:
-                    Quartz.CGEventTapEnable(self._event_tap, True)
                     return event
-                if kCGEventTapDisabledByUserInput is not None and type_ == kCGEventTapDisabledByUserInput:
-                    Quartz.CGEventTapEnable(self._event_tap, True)
-                    return event
-
-                if type_ not in (kCGEventKeyDown, kCGEventKeyUp):
-                    return event
-
-                code = Quartz.CGEventGetIntegerValueField(
-                    event, Quartz.kCGKeyboardEventKeycode
-                )
-                is_down = type_ == kCGEventKeyDown
-                is_up = type_ == kCGEventKeyUp
-
-                if self._ptt_keycode is not None and code == self._ptt_keycode:
-                    if is_down and not self._ptt_is_down:
-                        self._ptt_is_down = True
-                        QMetaObject.invokeMethod(
-                            self, "_emit_pressed",
-                            Qt.ConnectionType.QueuedConnection,
-                        )
-                    elif is_up and self._ptt_is_down:
-                        self._ptt_is_down = False
-                        QMetaObject.invokeMethod(
-                            self, "_emit_released",
-                            Qt.ConnectionType.QueuedConnection,
-                        )
-                    return None
-
-                if self._toggle_keycode is not None and code == self._toggle_keycode:
-                    if is_down and not self._toggle_is_down:
-                        self._toggle_is_down = True
-                        QMetaObject.invokeMethod(
-                            self, "_emit_toggle",
-                            Qt.ConnectionType.QueuedConnection,
-                        )
-                    elif is_up and self._toggle_is_down:
-                        self._toggle_is_down = False
-                    return None
 
+                # The system disables a tap that times out or on user input.
+                if self._running and type_ in tap_disabled:
+                    Quartz.CGEventTapEnable(self._event_tap, True)
                 return event
 
             self._tap_callback = tap_callback
@@ -635,11 +759,13 @@ class MacHotkeyManager(BaseHotkeyManager):
             )
             Quartz.CGEventTapEnable(self._event_tap, True)
 
-            # Run loop with periodic wakeups so stop() can end the thread.
+            # Sleep until an event arrives or stop() queues a CFRunLoopStop.
+            # The run loop is published before _running is checked, so a
+            # stop() that finds it set always gets its block run.
+            self._run_loop = run_loop
             while self._running:
-                CoreFoundation.CFRunLoopRunInMode(
-                    CoreFoundation.kCFRunLoopDefaultMode, 0.25, True
-                )
+                CoreFoundation.CFRunLoopRun()
+            self._run_loop = None
 
             try:
                 Quartz.CGEventTapEnable(self._event_tap, False)
@@ -650,20 +776,19 @@ class MacHotkeyManager(BaseHotkeyManager):
         self._thread = threading.Thread(target=thread_main, daemon=True)
         self._thread.start()
 
-    @Slot()
-    def _emit_pressed(self):
-        self.ptt_pressed.emit()
-
-    @Slot()
-    def _emit_released(self):
-        self.ptt_released.emit()
-
-    @Slot()
-    def _emit_toggle(self):
-        self.toggle_pressed.emit()
-
     def stop(self):
         self._running = False
+        run_loop = self._run_loop
+        if run_loop is not None:
+            import CoreFoundation
+            # A queued block survives until the loop next runs, unlike a
+            # bare CFRunLoopStop() issued while the thread is not yet inside it.
+            CoreFoundation.CFRunLoopPerformBlock(
+                run_loop,
+                CoreFoundation.kCFRunLoopDefaultMode,
+                lambda: CoreFoundation.CFRunLoopStop(run_loop),
+            )
+            CoreFoundation.CFRunLoopWakeUp(run_loop)
         if self._thread is not None:
             self._thread.join(timeout=2.0)
             self._thread = None
@@ -681,8 +806,12 @@ class PynputHotkeyManager(BaseHotkeyManager):
     ):
         super().__init__(ptt_key_name, toggle_key_name, parent)
         self._listener = None
+        self._ptt_key = None
+        self._toggle_key = None
 
-    def _parse_key(self, key_name: str):
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _parse_key(key_name: str):
         from pynput.keyboard import Key, KeyCode
         key_name = (key_name or "").lower()
         if not key_name:
@@ -700,53 +829,53 @@ class PynputHotkeyManager(BaseHotkeyManager):
             return KeyCode.from_char(key_name)
         return None
 
+    def set_keys(self, ptt_key_name: str, toggle_key_name: str | None = None):
+        # The listener callbacks read the current keys on every event.
+        ptt_key = self._parse_key(ptt_key_name)
+        if ptt_key is None:
+            logger.error("Unknown push-to-talk key name for pynput: %s", ptt_key_name)
+        self._ptt_is_down = False
+        self._toggle_is_down = False
+        self._ptt_key_name = ptt_key_name
+        self._toggle_key_name = toggle_key_name or ""
+        self._ptt_key = ptt_key
+        self._toggle_key = self._parse_key(self._toggle_key_name)
+        if self._listener is None:
+            # start() bailed out earlier on an unknown key, so nothing is
+            # listening yet.
+            self.start()
+
     def start(self):
         from pynput.keyboard import Listener
         ptt_key = self._parse_key(self._ptt_key_name)
         if ptt_key is None:
             logger.error("Unknown push-to-talk key name for pynput: %s", self._ptt_key_name)
             return
-        toggle_key = self._parse_key(self._toggle_key_name)
+        self._ptt_key = ptt_key
+        self._toggle_key = self._parse_key(self._toggle_key_name)
 
         def on_press(key):
+            ptt_key = self._ptt_key
+            toggle_key = self._toggle_key
             if key == ptt_key and not self._ptt_is_down:
                 self._ptt_is_down = True
-                QMetaObject.invokeMethod(
-                    self, "_emit_pressed",
-                    Qt.ConnectionType.QueuedConnection,
-                )
+                self.ptt_pressed.emit()
             elif toggle_key is not None and key == toggle_key and not self._toggle_is_down:
                 self._toggle_is_down = True
-                QMetaObject.invokeMethod(
-                    self, "_emit_toggle",
-                    Qt.ConnectionType.QueuedConnection,
-                )
+                self.toggle_pressed.emit()
 
         def on_release(key):
+            ptt_key = self._ptt_key
+            toggle_key = self._toggle_key
             if key == ptt_key and self._ptt_is_down:
                 self._ptt_is_down = False
-                QMetaObject.invokeMethod(
-                    self, "_emit_released",
-                    Qt.ConnectionType.QueuedConnection,
-                )
+                self.ptt_released.emit()
             elif toggle_key is not None and key == toggle_key and self._toggle_is_down:
                 self._toggle_is_down = False
 
         self._listener = Listener(on_press=on_press, on_release=on_release)
         self._listener.start()
 
-    @Slot()
-    def _emit_pressed(self):
-        self.ptt_pressed.emit()
-
-    @Slot()
-    def _emit_released(self):
-        self.ptt_released.emit()
-
-    @Slot()
-    def _emit_toggle(self):
-        self.toggle_pressed.emit()
-
     def stop(self):
         if self._listener is not None:
             self._listener.stop()
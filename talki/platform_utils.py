@@ -2,10 +2,17 @@
 
 import os
 import sys
-import grp
+import time
+from functools import lru_cache
 from pathlib import Path
 
+KEYBOARD_CACHE_TTL_S = 2.0
+_keyboards_cache: list[str] | None = None
+_keyboards_cache_time = 0.0
 
+
+# Neither value can change while the process runs, so both are computed once.
+@lru_cache(maxsize=None)
 def get_platform() -> str:
     if sys.platform.startswith("linux"):
         return "linux"
@@ -16,6 +23,7 @@ def get_platform() -> str:
     return "unknown"
 
 
+@lru_cache(maxsize=None)
 def get_display_server() -> str:
     if get_platform() != "linux":
         return "unknown"
@@ -31,17 +39,35 @@ def check_input_group() -> bool:
     """Check if the current user is in the 'input' group (Linux only)."""
     if get_platform() != "linux":
         return True
+    input_gid = _get_input_gid()
+    return input_gid is not None and input_gid in os.getgroups()
+
+
+@lru_cache(maxsize=1)
+def _get_input_gid() -> int | None:
+    # The NSS lookup can go out to sssd/LDAP; the gid is fixed for the session.
+    import grp
     try:
-        input_gid = grp.getgrnam("input").gr_gid
-        return input_gid in os.getgroups()
+        return grp.getgrnam("input").gr_gid
     except KeyError:
-        return False
+        return None
+
 
+def check_accessibility_permissions(refresh: bool = False) -> bool:
+    """Check if accessibility permissions are granted (macOS only).
 
-def check_accessibility_permissions() -> bool:
-    """Check if accessibility permissions are granted (macOS only)."""
+    The probe spawns osascript, so its result is cached; pass refresh=True
+    to re-check after the user may have granted access.
+    """
     if get_platform() != "macos":
         return True
+    if refresh:
+        _probe_accessibility.cache_clear()
+    return _probe_accessibility()
+
+
+@lru_cache(maxsize=1)
+def _probe_accessibility() -> bool:
     try:
         import subprocess
         result = subprocess.run(
@@ -54,6 +80,7 @@ def check_accessibility_permissions() -> bool:
         return False
 
 
+@lru_cache(maxsize=None)
 def get_config_dir() -> Path:
     platform = get_platform()
     if platform == "linux":
@@ -69,22 +96,50 @@ def get_config_dir() -> Path:
     new_cfg = new_dir / "config.json"
     old_cfg = old_dir / "config.json"
 
-    # One-time migration from the old project name to Talki.
-    if old_cfg.exists() and not new_cfg.exists():
-        try:
-            new_dir.mkdir(parents=True, exist_ok=True)
-            new_cfg.write_text(old_cfg.read_text())
-        except Exception:
-            pass
+    # Steady state: the config already exists, so there is nothing to
+    # migrate and the directory is in place.
+    try:
+        new_cfg.stat()
+        return new_dir
+    except OSError:
+        pass
 
     new_dir.mkdir(parents=True, exist_ok=True)
+
+    # One-time migration from the old project name to Talki. The new config
+    # is known to be missing here; reading the old one doubles as the
+    # existence check.
+    try:
+        new_cfg.write_text(old_cfg.read_text())
+    except Exception:
+        pass
+
     return new_dir
 
 
-def get_evdev_keyboard_devices() -> list[str]:
-    """Return paths to keyboard evdev devices (Linux only)."""
+def get_evdev_keyboard_devices(ttl: float = KEYBOARD_CACHE_TTL_S) -> list[str]:
+    """Return paths to keyboard evdev devices (Linux only).
+
+    The scan opens every input device node, so results are reused for
+    ``ttl`` seconds.
+    """
+    global _keyboards_cache, _keyboards_cache_time
     if get_platform() != "linux":
         return []
+    now = time.monotonic()
+    if _keyboards_cache is None or now - _keyboards_cache_time > ttl:
+        _keyboards_cache = _scan_evdev_keyboard_devices()
+        _keyboards_cache_time = now
+    return list(_keyboards_cache)
+
+
+# Name prefixes of the virtual devices we create ourselves.
+_OWN_DEVICE_PREFIXES = ("talki", "speech-injector")
+# Common keyboard keys: KEY_A=30, KEY_ENTER=28.
+_KEYBOARD_KEYS = frozenset((30, 28))
+
+
+def _scan_evdev_keyboard_devices() -> list[str]:
     try:
         import evdev
         devices = []
@@ -94,15 +149,16 @@ def get_evdev_keyboard_devices() -> list[str]:
                 # Avoid accidentally grabbing our own virtual devices.
                 # Grabbing a uinput device we created can cause event loops.
                 name = (dev.name or "").lower()
-                if name.startswith("talki") or name.startswith("speech-injector"):
+                if name.startswith(_OWN_DEVICE_PREFIXES):
                     dev.close()
                     continue
-                caps = dev.capabilities(verbose=False)
-                # EV_KEY = 1; check for common keyboard keys (KEY_A=30, KEY_ENTER=28)
-                if 1 in caps:
-                    key_caps = caps[1]
-                    if 30 in key_caps and 28 in key_caps:
-                        devices.append(path)
+                # absinfo=False skips the per-axis EVIOCGABS ioctls that
+                # touchpads and joysticks would otherwise cost.
+                caps = dev.capabilities(verbose=False, absinfo=False)
+                # EV_KEY = 1
+                key_caps = caps.get(1)
+                if key_caps and _KEYBOARD_KEYS.issubset(key_caps):
+                    devices.append(path)
                 dev.close()
             except (PermissionError, OSError):
                 continue
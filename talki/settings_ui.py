@@ -1,14 +1,16 @@
 """Settings dialog with tabs for audio, hotkey, and injection configuration."""
 
+from types import MappingProxyType
+
 from PySide6.QtWidgets import (
     QDialog, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
     QComboBox, QPushButton, QLabel, QSlider, QDialogButtonBox, QGroupBox,
     QMessageBox,
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QThreadPool, Signal, Slot
 
 from .config import Config
-from .audio_capture import list_input_devices
+from .audio_capture import list_input_devices, invalidate_device_cache
 from .platform_utils import get_platform, get_display_server, check_input_group
 
 
@@ -19,6 +21,13 @@ MODEL_SIZES = [
     ("medium", "Best accuracy, slowest"),
 ]
 
+COMPUTE_TYPES = [
+    ("auto", "Auto (recommended)"),
+    ("int8", "int8 - Fastest, smallest"),
+    ("int8_float32", "int8 weights, float32 compute"),
+    ("float32", "float32 - Slowest, no quantization"),
+]
+
 LANGUAGES = [
     ("en", "English"),
     ("auto", "Auto-detect"),
@@ -82,58 +91,62 @@ class KeyCaptureButton(QPushButton):
         return self._current_key
 
 
+# Read-only: shared by every key capture.
+_QT_KEY_MAP = MappingProxyType({
+    Qt.Key.Key_F1: "F1", Qt.Key.Key_F2: "F2", Qt.Key.Key_F3: "F3",
+    Qt.Key.Key_F4: "F4", Qt.Key.Key_F5: "F5", Qt.Key.Key_F6: "F6",
+    Qt.Key.Key_F7: "F7", Qt.Key.Key_F8: "F8", Qt.Key.Key_F9: "F9",
+    Qt.Key.Key_F10: "F10", Qt.Key.Key_F11: "F11", Qt.Key.Key_F12: "F12",
+    Qt.Key.Key_Space: "space",
+    Qt.Key.Key_Tab: "tab",
+    Qt.Key.Key_Return: "enter", Qt.Key.Key_Enter: "enter",
+    Qt.Key.Key_Backspace: "backspace",
+    Qt.Key.Key_CapsLock: "capslock",
+    Qt.Key.Key_Control: "ctrl",
+    Qt.Key.Key_Alt: "alt",
+    Qt.Key.Key_Shift: "shift",
+    Qt.Key.Key_Meta: "meta",
+    Qt.Key.Key_Insert: "insert",
+    Qt.Key.Key_Delete: "delete",
+    Qt.Key.Key_Home: "home",
+    Qt.Key.Key_End: "end",
+    Qt.Key.Key_PageUp: "pageup",
+    Qt.Key.Key_PageDown: "pagedown",
+    Qt.Key.Key_Pause: "pause",
+    Qt.Key.Key_ScrollLock: "scrolllock",
+    Qt.Key.Key_Print: "print",
+
+    # Punctuation / OEM-ish keys (stored as canonical names)
+    Qt.Key.Key_QuoteLeft: "grave",
+    Qt.Key.Key_AsciiTilde: "grave",
+    Qt.Key.Key_Minus: "minus",
+    Qt.Key.Key_Underscore: "minus",
+    Qt.Key.Key_Equal: "equal",
+    Qt.Key.Key_Plus: "equal",
+    Qt.Key.Key_BracketLeft: "bracket_left",
+    Qt.Key.Key_BraceLeft: "bracket_left",
+    Qt.Key.Key_BracketRight: "bracket_right",
+    Qt.Key.Key_BraceRight: "bracket_right",
+    Qt.Key.Key_Backslash: "backslash",
+    Qt.Key.Key_Bar: "backslash",
+    Qt.Key.Key_Semicolon: "semicolon",
+    Qt.Key.Key_Colon: "semicolon",
+    Qt.Key.Key_Apostrophe: "apostrophe",
+    Qt.Key.Key_QuoteDbl: "apostrophe",
+    Qt.Key.Key_Comma: "comma",
+    Qt.Key.Key_Less: "comma",
+    Qt.Key.Key_Period: "period",
+    Qt.Key.Key_Greater: "period",
+    Qt.Key.Key_Slash: "slash",
+    Qt.Key.Key_Question: "slash",
+})
+
+
 def _qt_key_to_name(key: int) -> str | None:
     """Convert a Qt key code to a portable key name string."""
-    key_map = {
-        Qt.Key.Key_F1: "F1", Qt.Key.Key_F2: "F2", Qt.Key.Key_F3: "F3",
-        Qt.Key.Key_F4: "F4", Qt.Key.Key_F5: "F5", Qt.Key.Key_F6: "F6",
-        Qt.Key.Key_F7: "F7", Qt.Key.Key_F8: "F8", Qt.Key.Key_F9: "F9",
-        Qt.Key.Key_F10: "F10", Qt.Key.Key_F11: "F11", Qt.Key.Key_F12: "F12",
-        Qt.Key.Key_Space: "space",
-        Qt.Key.Key_Tab: "tab",
-        Qt.Key.Key_Return: "enter", Qt.Key.Key_Enter: "enter",
-        Qt.Key.Key_Backspace: "backspace",
-        Qt.Key.Key_CapsLock: "capslock",
-        Qt.Key.Key_Control: "ctrl",
-        Qt.Key.Key_Alt: "alt",
-        Qt.Key.Key_Shift: "shift",
-        Qt.Key.Key_Meta: "meta",
-        Qt.Key.Key_Insert: "insert",
-        Qt.Key.Key_Delete: "delete",
-        Qt.Key.Key_Home: "home",
-        Qt.Key.Key_End: "end",
-        Qt.Key.Key_PageUp: "pageup",
-        Qt.Key.Key_PageDown: "pagedown",
-        Qt.Key.Key_Pause: "pause",
-        Qt.Key.Key_ScrollLock: "scrolllock",
-        Qt.Key.Key_Print: "print",
-
-        # Punctuation / OEM-ish keys (stored as canonical names)
-        Qt.Key.Key_QuoteLeft: "grave",
-        Qt.Key.Key_AsciiTilde: "grave",
-        Qt.Key.Key_Minus: "minus",
-        Qt.Key.Key_Underscore: "minus",
-        Qt.Key.Key_Equal: "equal",
-        Qt.Key.Key_Plus: "equal",
-        Qt.Key.Key_BracketLeft: "bracket_left",
-        Qt.Key.Key_BraceLeft: "bracket_left",
-        Qt.Key.Key_BracketRight: "bracket_right",
-        Qt.Key.Key_BraceRight: "bracket_right",
-        Qt.Key.Key_Backslash: "backslash",
-        Qt.Key.Key_Bar: "backslash",
-        Qt.Key.Key_Semicolon: "semicolon",
-        Qt.Key.Key_Colon: "semicolon",
-        Qt.Key.Key_Apostrophe: "apostrophe",
-        Qt.Key.Key_QuoteDbl: "apostrophe",
-        Qt.Key.Key_Comma: "comma",
-        Qt.Key.Key_Less: "comma",
-        Qt.Key.Key_Period: "period",
-        Qt.Key.Key_Greater: "period",
-        Qt.Key.Key_Slash: "slash",
-        Qt.Key.Key_Question: "slash",
-    }
-    if key in key_map:
-        return key_map[key]
+    name = _QT_KEY_MAP.get(key)
+    if name is not None:
+        return name
     # Letters and digits
     if Qt.Key.Key_A <= key <= Qt.Key.Key_Z:
         return chr(key).lower()
@@ -143,9 +156,17 @@ def _qt_key_to_name(key: int) -> str | None:
 
 
 class SettingsDialog(QDialog):
+    # Emitted from a pool thread with the result of list_input_devices().
+    _devices_ready = Signal(list)
+
     def __init__(self, config: Config, parent=None):
         super().__init__(parent)
         self._config = config
+        # Device to select once the running scan finishes; None means the
+        # combo is populated and currentData() is authoritative.
+        self._pending_device_id: int | None = None
+        self._device_scan_pending = False
+        self._devices_ready.connect(self._on_devices_ready)
         self.setWindowTitle("Talki - Settings")
         self.setMinimumWidth(480)
         self._setup_ui()
@@ -200,7 +221,7 @@ class SettingsDialog(QDialog):
             QComboBox.SizeAdjustPolicy.AdjustToContents)
         device_row.addWidget(self._device_combo, 1)
         refresh_btn = QPushButton("Refresh")
-        refresh_btn.clicked.connect(self._refresh_devices)
+        refresh_btn.clicked.connect(self._on_refresh_clicked)
         device_row.addWidget(refresh_btn)
         form.addRow("Input device:", device_row)
 
@@ -210,6 +231,12 @@ class SettingsDialog(QDialog):
             self._model_combo.addItem(f"{value} - {desc}", value)
         form.addRow("Model size:", self._model_combo)
 
+        # Compute type
+        self._compute_combo = QComboBox()
+        for value, desc in COMPUTE_TYPES:
+            self._compute_combo.addItem(desc, value)
+        form.addRow("Compute type:", self._compute_combo)
+
         # Language
         self._lang_combo = QComboBox()
         for code, name in LANGUAGES:
@@ -291,20 +318,56 @@ class SettingsDialog(QDialog):
 
         return tab
 
-    def _refresh_devices(self):
+    def _on_refresh_clicked(self):
+        invalidate_device_cache()
+        self._refresh_devices(self._selected_device_id())
+
+    def _refresh_devices(self, selected_id: int | None = None):
+        # Querying PortAudio can stall for a while on some systems, so the
+        # scan runs on a pool thread and the combo is filled when it returns.
+        if not self._device_scan_pending:
+            self._pending_device_id = selected_id
+        self._device_scan_pending = True
+        self._device_combo.setEnabled(False)
+
+        def scan():
+            try:
+                devices = list_input_devices()
+            except Exception:
+                devices = []
+            try:
+                self._devices_ready.emit(devices)
+            except RuntimeError:
+                # The dialog was closed and deleted before the scan finished.
+                pass
+
+        QThreadPool.globalInstance().start(scan)
+
+    @Slot(list)
+    def _on_devices_ready(self, devices: list):
+        selected_id = self._pending_device_id
+        self._device_scan_pending = False
+        self._pending_device_id = None
+
         self._device_combo.clear()
         self._device_combo.addItem("System default", None)
-        for dev in list_input_devices():
+        for dev in devices:
             self._device_combo.addItem(dev["name"], dev["id"])
-
-    def _load_values(self):
-        # Devices
-        self._refresh_devices()
-        if self._config.input_device_id is not None:
+        if selected_id is not None:
             for i in range(self._device_combo.count()):
-                if self._device_combo.itemData(i) == self._config.input_device_id:
+                if self._device_combo.itemData(i) == selected_id:
                     self._device_combo.setCurrentIndex(i)
                     break
+        self._device_combo.setEnabled(True)
+
+    def _selected_device_id(self) -> int | None:
+        if self._device_scan_pending:
+            return self._pending_device_id
+        return self._device_combo.currentData()
+
+    def _load_values(self):
+        # Devices
+        self._refresh_devices(self._config.input_device_id)
 
         # Model
         for i in range(self._model_combo.count()):
@@ -312,6 +375,12 @@ class SettingsDialog(QDialog):
                 self._model_combo.setCurrentIndex(i)
                 break
 
+        # Compute type
+        for i in range(self._compute_combo.count()):
+            if self._compute_combo.itemData(i) == self._config.compute_type:
+                self._compute_combo.setCurrentIndex(i)
+                break
+
         # Language
         for i in range(self._lang_combo.count()):
             if self._lang_combo.itemData(i) == self._config.language:
@@ -329,7 +398,7 @@ class SettingsDialog(QDialog):
                 break
 
     def _save_and_accept(self):
-        self._config.input_device_id = self._device_combo.currentData()
+        self._config.input_device_id = self._selected_device_id()
         self._config.push_to_talk_key = self._key_capture.get_key()
         self._config.toggle_record_key = self._toggle_key_capture.get_key()
 
@@ -346,6 +415,7 @@ class SettingsDialog(QDialog):
             return
 
         self._config.model_size = self._model_combo.currentData()
+        self._config.compute_type = self._compute_combo.currentData()
         self._config.language = self._lang_combo.currentData()
         self._config.injection_mode = self._injection_combo.currentData()
         self._config.transcribe_interval_ms = self._interval_slider.value()
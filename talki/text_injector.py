@@ -5,9 +5,11 @@ Windows/macOS: pynput Controller.type() with clipboard fallback.
 """
 
 import logging
-import time
+import os
+import struct
+import threading
 from collections import deque
-from dataclasses import dataclass
+from functools import lru_cache, partial
 
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTimer
@@ -17,7 +19,26 @@ from .platform_utils import get_platform
 logger = logging.getLogger(__name__)
 
 
+# Held for every synthetic key sequence. Typing runs on a pool thread while
+# clipboard pastes run on the GUI thread, and both drive the same device (the
+# shared uinput keyboard, or the OS input queue for pynput): without it, typed
+# characters could land between a paste's Ctrl/Cmd press and release and act
+# as shortcuts.
+_key_lock = threading.Lock()
+# How long a paste waits before retrying while typing holds _key_lock; the
+# GUI thread never blocks on the lock.
+_KEY_LOCK_RETRY_MS = 10
+
+
+def _run_on_gui_thread(func, *args):
+    # Clipboard access and QTimer-driven pumps must run on the GUI thread.
+    QTimer.singleShot(0, QApplication.instance(), partial(func, *args))
+
+
 class BaseTextInjector:
+    # True if inject() may be called off the GUI thread.
+    thread_safe = False
+
     def inject(self, text: str):
         raise NotImplementedError
 
@@ -25,6 +46,24 @@ class BaseTextInjector:
         pass
 
 
+class _LazyTextInjector(BaseTextInjector):
+    """Creates the wrapped injector on the first inject() call."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._inner: BaseTextInjector | None = None
+
+    def inject(self, text: str):
+        if self._inner is None:
+            self._inner = self._factory()
+        self._inner.inject(text)
+
+    def close(self):
+        if self._inner is not None:
+            self._inner.close()
+            self._inner = None
+
+
 class LinuxClipboardTextInjector(BaseTextInjector):
     """Linux text injector using clipboard + uinput Ctrl+V.
 
@@ -32,12 +71,18 @@ class LinuxClipboardTextInjector(BaseTextInjector):
     at the kernel level, bypassing the display server.
     """
 
-    def __init__(self):
-        import evdev
-        from evdev import ecodes
-        self._uinput = evdev.UInput({
-            ecodes.EV_KEY: [ecodes.KEY_LEFTCTRL, ecodes.KEY_V],
-        }, name="talki-clipboard")
+    def __init__(self, uinput=None):
+        # A passed-in uinput device is shared with its owner and left open
+        # on close().
+        self._owns_uinput = uinput is None
+        if uinput is None:
+            import evdev
+            from evdev import ecodes
+            uinput = evdev.UInput({
+                ecodes.EV_KEY: [ecodes.KEY_LEFTCTRL, ecodes.KEY_V],
+            }, name="talki-clipboard")
+        self._uinput = uinput
+        self._clipboard = QApplication.clipboard()
         self._queue: deque[str] = deque()
         self._busy = False
         self._saved_clipboard_text: str = ""
@@ -55,7 +100,7 @@ class LinuxClipboardTextInjector(BaseTextInjector):
             return
 
         self._busy = True
-        self._saved_clipboard_text = QApplication.clipboard().text()
+        self._saved_clipboard_text = self._clipboard.text()
         self._pump()
 
     def _pump(self):
@@ -63,49 +108,175 @@ class LinuxClipboardTextInjector(BaseTextInjector):
             QTimer.singleShot(self._restore_delay_ms, self._restore_clipboard)
             return
 
-        next_text = self._queue.popleft()
-        QApplication.clipboard().setText(next_text)
+        # Paste everything queued so far in one go; a burst of short
+        # segments would otherwise cost a full paste cycle each.
+        next_text = "".join(self._queue)
+        self._queue.clear()
+        self._clipboard.setText(next_text)
         QTimer.singleShot(self._set_clipboard_delay_ms, self._paste)
 
     def _paste(self):
         from evdev import ecodes
 
+        if not _key_lock.acquire(blocking=False):
+            QTimer.singleShot(_KEY_LOCK_RETRY_MS, self._paste)
+            return
         # Simulate Ctrl+V via uinput. Avoid sleeps; keep Qt responsive so the
         # compositor/app can request clipboard data (especially on Wayland).
-        self._uinput.write(ecodes.EV_KEY, ecodes.KEY_LEFTCTRL, 1)
-        self._uinput.syn()
-        self._uinput.write(ecodes.EV_KEY, ecodes.KEY_V, 1)
-        self._uinput.syn()
-        self._uinput.write(ecodes.EV_KEY, ecodes.KEY_V, 0)
-        self._uinput.syn()
-        self._uinput.write(ecodes.EV_KEY, ecodes.KEY_LEFTCTRL, 0)
-        self._uinput.syn()
+        try:
+            self._uinput.write(ecodes.EV_KEY, ecodes.KEY_LEFTCTRL, 1)
+            self._uinput.syn()
+            self._uinput.write(ecodes.EV_KEY, ecodes.KEY_V, 1)
+            self._uinput.syn()
+            self._uinput.write(ecodes.EV_KEY, ecodes.KEY_V, 0)
+            self._uinput.syn()
+            self._uinput.write(ecodes.EV_KEY, ecodes.KEY_LEFTCTRL, 0)
+            self._uinput.syn()
+        finally:
+            _key_lock.release()
 
         QTimer.singleShot(self._post_paste_delay_ms, self._pump)
 
     def _restore_clipboard(self):
-        QApplication.clipboard().setText(self._saved_clipboard_text)
+        self._clipboard.setText(self._saved_clipboard_text)
         self._saved_clipboard_text = ""
         self._busy = False
 
         # If new text arrived while we were restoring, start a new batch.
         if self._queue:
             self._busy = True
-            self._saved_clipboard_text = QApplication.clipboard().text()
+            self._saved_clipboard_text = self._clipboard.text()
             self._pump()
 
     def close(self):
         if self._uinput is not None:
-            self._uinput.close()
+            if self._owns_uinput:
+                self._uinput.close()
             self._uinput = None
         self._queue.clear()
         self._busy = False
 
 
-@dataclass(frozen=True)
-class _Keypress:
-    code: int
-    shift: bool = False
+# A keypress is packed into one int: the evdev key code in the low 16 bits,
+# plus _SHIFT when the key needs shift held.
+_SHIFT = 0x10000
+_CODE_MASK = 0xFFFF
+
+# struct input_event: timeval (sec, usec), type, code, value. A zero
+# timestamp is filled in by the kernel.
+_INPUT_EVENT = struct.Struct("llHHi")
+
+
+# These are fixed by the evdev key codes, so they are built once and shared
+# by every injector instead of per instance.
+@lru_cache(maxsize=None)
+def _get_char_map() -> dict[str, int]:
+    from evdev import ecodes
+    # US keyboard layout mapping for common punctuation.
+    # Keep this intentionally small; fall back to clipboard for the rest.
+    return {
+        " ": ecodes.KEY_SPACE,
+        "\n": ecodes.KEY_ENTER,
+        "\t": ecodes.KEY_TAB,
+
+        "-": ecodes.KEY_MINUS,
+        "_": ecodes.KEY_MINUS | _SHIFT,
+        "=": ecodes.KEY_EQUAL,
+        "+": ecodes.KEY_EQUAL | _SHIFT,
+
+        "[": ecodes.KEY_LEFTBRACE,
+        "{": ecodes.KEY_LEFTBRACE | _SHIFT,
+        "]": ecodes.KEY_RIGHTBRACE,
+        "}": ecodes.KEY_RIGHTBRACE | _SHIFT,
+        "\\": ecodes.KEY_BACKSLASH,
+        "|": ecodes.KEY_BACKSLASH | _SHIFT,
+
+        ";": ecodes.KEY_SEMICOLON,
+        ":": ecodes.KEY_SEMICOLON | _SHIFT,
+        "'": ecodes.KEY_APOSTROPHE,
+        "\"": ecodes.KEY_APOSTROPHE | _SHIFT,
+        "`": ecodes.KEY_GRAVE,
+        "~": ecodes.KEY_GRAVE | _SHIFT,
+
+        ",": ecodes.KEY_COMMA,
+        "<": ecodes.KEY_COMMA | _SHIFT,
+        ".": ecodes.KEY_DOT,
+        ">": ecodes.KEY_DOT | _SHIFT,
+        "/": ecodes.KEY_SLASH,
+        "?": ecodes.KEY_SLASH | _SHIFT,
+
+        "!": ecodes.KEY_1 | _SHIFT,
+        "@": ecodes.KEY_2 | _SHIFT,
+        "#": ecodes.KEY_3 | _SHIFT,
+        "$": ecodes.KEY_4 | _SHIFT,
+        "%": ecodes.KEY_5 | _SHIFT,
+        "^": ecodes.KEY_6 | _SHIFT,
+        "&": ecodes.KEY_7 | _SHIFT,
+        "*": ecodes.KEY_8 | _SHIFT,
+        "(": ecodes.KEY_9 | _SHIFT,
+        ")": ecodes.KEY_0 | _SHIFT,
+    }
+
+
+@lru_cache(maxsize=None)
+def _get_ascii_table() -> tuple[int | None, ...]:
+    # Indexed by ord(ch) for ch < 128; None where no key is mapped.
+    from evdev import ecodes
+    table: list[int | None] = [None] * 128
+    for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+        code = getattr(ecodes, f"KEY_{letter}")
+        table[ord(letter.lower())] = code
+        table[ord(letter)] = code | _SHIFT
+    for digit in "0123456789":
+        table[ord(digit)] = getattr(ecodes, f"KEY_{digit}")
+    for ch, mapping in _get_char_map().items():
+        table[ord(ch)] = mapping
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def _get_event_table() -> tuple[bytes | None, ...]:
+    # The packed input_event records for typing each ASCII character: one
+    # frame (ending in SYN_REPORT) per character, shift pressed around the key.
+    from evdev import ecodes
+    pack = _INPUT_EVENT.pack
+    ev_key = ecodes.EV_KEY
+    shift_down = pack(0, 0, ev_key, ecodes.KEY_LEFTSHIFT, 1)
+    shift_up = pack(0, 0, ev_key, ecodes.KEY_LEFTSHIFT, 0)
+    syn = pack(0, 0, ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+    table: list[bytes | None] = []
+    for mapping in _get_ascii_table():
+        if mapping is None:
+            table.append(None)
+            continue
+        code = mapping & _CODE_MASK
+        events = pack(0, 0, ev_key, code, 1) + pack(0, 0, ev_key, code, 0)
+        if mapping & _SHIFT:
+            events = shift_down + events + shift_up
+        table.append(events + syn)
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def _get_required_keys() -> tuple[int, ...]:
+    from evdev import ecodes
+    # KEY_LEFTCTRL lets the clipboard fallback paste through the same device.
+    required_keys = {ecodes.KEY_LEFTSHIFT, ecodes.KEY_LEFTCTRL}
+    required_keys.update(
+        mapping & _CODE_MASK
+        for mapping in _get_ascii_table() if mapping is not None
+    )
+    # Sorted once here; UInput takes the sequence as-is.
+    return tuple(sorted(required_keys))
+
+
+def _create_keypress_uinput():
+    import evdev
+    from evdev import ecodes
+    return evdev.UInput(
+        {ecodes.EV_KEY: _get_required_keys()},
+        name="talki-keypress",
+    )
 
 
 class LinuxKeypressTextInjector(BaseTextInjector):
@@ -114,134 +285,48 @@ class LinuxKeypressTextInjector(BaseTextInjector):
     Notes:
     - Uses a US keyboard layout mapping for punctuation.
     - Falls back to a clipboard injector for unsupported characters (Unicode).
+    - inject() is thread-safe; the fallback is always run on the GUI thread.
     """
 
-    def __init__(self, fallback: BaseTextInjector | None = None):
-        import evdev
-        from evdev import ecodes
+    thread_safe = True
 
+    def __init__(self, fallback: BaseTextInjector | None = None, uinput=None):
         self._fallback = fallback
-        self._ecodes = ecodes
-        self._char_map = self._build_char_map(ecodes)
-
-        required_keys = {ecodes.KEY_LEFTSHIFT}
-        for mapping in self._char_map.values():
-            required_keys.add(mapping.code)
-        for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
-            required_keys.add(getattr(ecodes, f"KEY_{letter}"))
-        for digit in "0123456789":
-            required_keys.add(getattr(ecodes, f"KEY_{digit}"))
-
-        self._uinput = evdev.UInput(
-            {ecodes.EV_KEY: sorted(required_keys)},
-            name="talki-keypress",
-        )
+        self._event_table = _get_event_table()
+        # Owned either way: a passed-in device is closed by close() too.
+        self._uinput = uinput if uinput is not None else _create_keypress_uinput()
 
     def inject(self, text: str):
         if not text:
             return
 
         # Fast path: only attempt keypress typing if every character is mappable.
-        presses: list[_Keypress] = []
+        # Only ASCII characters have a mapping.
+        table = self._event_table
+        frames: list[bytes] = []
         for ch in text:
-            mapping = self._char_to_keypress(ch)
-            if mapping is None:
+            o = ord(ch)
+            events = table[o] if o < 128 else None
+            if events is None:
                 if self._fallback is not None:
                     logger.debug(
                         "Falling back to clipboard injection for unmappable text"
                     )
-                    self._fallback.inject(text)
+                    _run_on_gui_thread(self._fallback.inject, text)
                 else:
                     logger.warning("Dropped unmappable text: %r", text)
                 return
-            presses.append(mapping)
-
-        for kp in presses:
-            self._type_keypress(kp)
-
-    def _type_keypress(self, kp: _Keypress):
-        ecodes = self._ecodes
-        if kp.shift:
-            self._uinput.write(ecodes.EV_KEY, ecodes.KEY_LEFTSHIFT, 1)
-            self._uinput.syn()
-
-        self._uinput.write(ecodes.EV_KEY, kp.code, 1)
-        self._uinput.syn()
-        self._uinput.write(ecodes.EV_KEY, kp.code, 0)
-        self._uinput.syn()
-
-        if kp.shift:
-            self._uinput.write(ecodes.EV_KEY, ecodes.KEY_LEFTSHIFT, 0)
-            self._uinput.syn()
-
-    def _char_to_keypress(self, ch: str) -> _Keypress | None:
-        if not ch:
-            return None
-        if ch in self._char_map:
-            return self._char_map[ch]
-
-        # ASCII letters: KEY_A..KEY_Z (+ shift for uppercase)
-        if "a" <= ch <= "z":
-            code = getattr(self._ecodes, f"KEY_{ch.upper()}", None)
-            return _Keypress(code=code, shift=False) if code is not None else None
-        if "A" <= ch <= "Z":
-            code = getattr(self._ecodes, f"KEY_{ch}", None)
-            return _Keypress(code=code, shift=True) if code is not None else None
-
-        # Basic digits
-        if "0" <= ch <= "9":
-            code = getattr(self._ecodes, f"KEY_{ch}", None)
-            return _Keypress(code=code, shift=False) if code is not None else None
-
-        # Non-ASCII / unsupported
-        return None
-
-    @staticmethod
-    def _build_char_map(ecodes) -> dict[str, _Keypress]:
-        # US keyboard layout mapping for common punctuation.
-        # Keep this intentionally small; fall back to clipboard for the rest.
-        return {
-            " ": _Keypress(code=ecodes.KEY_SPACE),
-            "\n": _Keypress(code=ecodes.KEY_ENTER),
-            "\t": _Keypress(code=ecodes.KEY_TAB),
-
-            "-": _Keypress(code=ecodes.KEY_MINUS),
-            "_": _Keypress(code=ecodes.KEY_MINUS, shift=True),
-            "=": _Keypress(code=ecodes.KEY_EQUAL),
-            "+": _Keypress(code=ecodes.KEY_EQUAL, shift=True),
-
-            "[": _Keypress(code=ecodes.KEY_LEFTBRACE),
-            "{": _Keypress(code=ecodes.KEY_LEFTBRACE, shift=True),
-            "]": _Keypress(code=ecodes.KEY_RIGHTBRACE),
-            "}": _Keypress(code=ecodes.KEY_RIGHTBRACE, shift=True),
-            "\\": _Keypress(code=ecodes.KEY_BACKSLASH),
-            "|": _Keypress(code=ecodes.KEY_BACKSLASH, shift=True),
-
-            ";": _Keypress(code=ecodes.KEY_SEMICOLON),
-            ":": _Keypress(code=ecodes.KEY_SEMICOLON, shift=True),
-            "'": _Keypress(code=ecodes.KEY_APOSTROPHE),
-            "\"": _Keypress(code=ecodes.KEY_APOSTROPHE, shift=True),
-            "`": _Keypress(code=ecodes.KEY_GRAVE),
-            "~": _Keypress(code=ecodes.KEY_GRAVE, shift=True),
-
-            ",": _Keypress(code=ecodes.KEY_COMMA),
-            "<": _Keypress(code=ecodes.KEY_COMMA, shift=True),
-            ".": _Keypress(code=ecodes.KEY_DOT),
-            ">": _Keypress(code=ecodes.KEY_DOT, shift=True),
-            "/": _Keypress(code=ecodes.KEY_SLASH),
-            "?": _Keypress(code=ecodes.KEY_SLASH, shift=True),
-
-            "!": _Keypress(code=ecodes.KEY_1, shift=True),
-            "@": _Keypress(code=ecodes.KEY_2, shift=True),
-            "#": _Keypress(code=ecodes.KEY_3, shift=True),
-            "$": _Keypress(code=ecodes.KEY_4, shift=True),
-            "%": _Keypress(code=ecodes.KEY_5, shift=True),
-            "^": _Keypress(code=ecodes.KEY_6, shift=True),
-            "&": _Keypress(code=ecodes.KEY_7, shift=True),
-            "*": _Keypress(code=ecodes.KEY_8, shift=True),
-            "(": _Keypress(code=ecodes.KEY_9, shift=True),
-            ")": _Keypress(code=ecodes.KEY_0, shift=True),
-        }
+            frames.append(events)
+
+        # One write per character frame rather than one per event. Not the
+        # whole string at once: the kernel hands every event of a write to
+        # readers in one go, and a long string would overflow their ~64-event
+        # client buffers (SYN_DROPPED, lost or stuck keys). uinput consumes a
+        # frame of whole events per write, so there are no short writes.
+        fd = self._uinput.fd
+        with _key_lock:
+            for events in frames:
+                os.write(fd, events)
 
     def close(self):
         if self._uinput is not None:
@@ -255,48 +340,88 @@ class LinuxKeypressTextInjector(BaseTextInjector):
 
 
 class PynputTextInjector(BaseTextInjector):
-    """Windows/macOS text injector using pynput."""
+    """Windows/macOS text injector using pynput.
+
+    inject() is thread-safe; clipboard pastes are run on the GUI thread.
+    """
+
+    thread_safe = True
 
     def __init__(self, mode: str = "auto"):
         from pynput.keyboard import Controller
         self._controller = Controller()
         self._mode = mode
+        self._clipboard = QApplication.clipboard()
+        self._queue: deque[str] = deque()
+        self._busy = False
+        self._saved_clipboard_text: str = ""
+
+        # Pastes are paced with timers rather than sleeps so the GUI thread
+        # keeps serving clipboard requests from the target app.
+        self._set_clipboard_delay_ms = 50
+        self._post_paste_delay_ms = 150
 
     def inject(self, text: str):
         if not text:
             return
 
         if self._mode == "clipboard":
-            self._clipboard_paste(text)
+            _run_on_gui_thread(self._clipboard_paste, text)
             return
 
         # Check if text is pure ASCII - use direct typing
-        if all(ord(c) < 128 for c in text):
-            self._controller.type(text)
+        if text.isascii():
+            with _key_lock:
+                self._controller.type(text)
         else:
-            self._clipboard_paste(text)
+            _run_on_gui_thread(self._clipboard_paste, text)
 
     def _clipboard_paste(self, text: str):
-        from pynput.keyboard import Key
+        self._queue.append(text)
+        if self._busy:
+            return
+
+        self._busy = True
+        self._saved_clipboard_text = self._clipboard.text()
+        self._pump()
+
+    def _pump(self):
+        if not self._queue:
+            self._restore_clipboard()
+            return
 
-        clipboard = QApplication.clipboard()
-        saved_text = clipboard.text()
+        # Same batching as LinuxClipboardTextInjector._pump.
+        next_text = "".join(self._queue)
+        self._queue.clear()
+        self._clipboard.setText(next_text)
+        QTimer.singleShot(self._set_clipboard_delay_ms, self._paste)
 
-        clipboard.setText(text)
-        time.sleep(0.05)
+    def _paste(self):
+        from pynput.keyboard import Key
 
         # Cmd+V on macOS, Ctrl+V on Windows
+        if not _key_lock.acquire(blocking=False):
+            QTimer.singleShot(_KEY_LOCK_RETRY_MS, self._paste)
+            return
         modifier = Key.cmd if get_platform() == "macos" else Key.ctrl
-        with self._controller.pressed(modifier):
-            self._controller.press("v")
-            self._controller.release("v")
+        try:
+            with self._controller.pressed(modifier):
+                self._controller.press("v")
+                self._controller.release("v")
+        finally:
+            _key_lock.release()
 
-        time.sleep(0.15)
-        if saved_text:
-            clipboard.setText(saved_text)
+        QTimer.singleShot(self._post_paste_delay_ms, self._pump)
+
+    def _restore_clipboard(self):
+        if self._saved_clipboard_text:
+            self._clipboard.setText(self._saved_clipboard_text)
+        self._saved_clipboard_text = ""
+        self._busy = False
 
     def close(self):
-        pass
+        self._queue.clear()
+        self._busy = False
 
 
 def create_text_injector(mode: str = "auto") -> BaseTextInjector:
@@ -305,8 +430,14 @@ def create_text_injector(mode: str = "auto") -> BaseTextInjector:
         mode = (mode or "auto").lower()
         if mode == "clipboard":
             return LinuxClipboardTextInjector()
-        clipboard = LinuxClipboardTextInjector()
-        return LinuxKeypressTextInjector(fallback=clipboard)
+        # One virtual keyboard serves both: the keypress device also has
+        # Ctrl+V. Most dictation is plain ASCII, so the clipboard injector is
+        # only created once something needs it.
+        uinput = _create_keypress_uinput()
+        clipboard = _LazyTextInjector(
+            partial(LinuxClipboardTextInjector, uinput=uinput)
+        )
+        return LinuxKeypressTextInjector(fallback=clipboard, uinput=uinput)
     else:
         mode = (mode or "auto").lower()
         return PynputTextInjector(mode=mode)
@@ -1,58 +1,134 @@
 """Speech recognition with faster-whisper, chunked transcription worker (Talki)."""
 
 import logging
-import threading
+import os
 import re
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 import numpy as np
-from PySide6.QtCore import QThread, Signal, QObject
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
 
-from faster_whisper import WhisperModel
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
 
-from .audio_capture import AudioCapture, TARGET_SAMPLE_RATE, resample_audio
+from .audio_capture import AudioCapture, INITIAL_BUFFER_SECONDS, TARGET_SAMPLE_RATE
 
 logger = logging.getLogger(__name__)
 
 
 class Transcriber:
-    def __init__(self, model_size: str = "base", language: str = "en"):
+    def __init__(self, model_size: str = "base", language: str = "en",
+                 compute_type: str = "auto"):
         self._model: WhisperModel | None = None
+        self._model_size = model_size
         self._language = language
+        self._compute_type = compute_type
         self.load_model(model_size)
 
+    @property
+    def model_size(self) -> str:
+        return self._model_size
+
+    @property
+    def compute_type(self) -> str:
+        return self._compute_type
+
     def set_language(self, language: str):
         self._language = language
 
     def load_model(self, model_size: str):
-        logger.info("Loading faster-whisper model: %s", model_size)
+        # Imported here: faster-whisper pulls in CTranslate2 and friends, which
+        # dominates startup time if loaded with the module.
+        from faster_whisper import WhisperModel
+
+        logger.info("Loading faster-whisper model: %s (%s)",
+                    model_size, self._compute_type)
+        # model_size may also be the path of a CTranslate2-converted model
+        # directory. "auto" lets CTranslate2 pick the fastest type the CPU
+        # supports (int8 where available, using VNNI / i8mm dot products).
+        # Half the cores leaves room for capture, the UI and the app being
+        # typed into; one worker since passes run one at a time.
         self._model = WhisperModel(
             model_size,
             device="cpu",
-            compute_type="int8",
+            compute_type=self._compute_type,
+            cpu_threads=max(1, (os.cpu_count() or 2) // 2),
+            num_workers=1,
         )
+        self._model_size = model_size
         logger.info("Model loaded: %s", model_size)
 
-    def transcribe(self, audio: np.ndarray) -> str:
-        if self._model is None or len(audio) == 0:
-            return ""
-        kwargs = {}
+    def _segments(self, audio: np.ndarray, final: bool, **kwargs):
+        # faster-whisper wants contiguous float32; this is a no-op for the
+        # capture buffers and saves a silent convert-copy for anything else.
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
         if self._language and self._language != "auto":
             kwargs["language"] = self._language
+        if not final:
+            # Streaming passes are re-run on the next tick anyway, so greedy
+            # decoding is enough; only the final pass pays for beam search.
+            kwargs.update(beam_size=1, best_of=1, temperature=0.0,
+                          condition_on_previous_text=False)
+        else:
+            kwargs["beam_size"] = 5
+        # The worker already skips audio without speech (see
+        # _speech_bounds), so VAD is not run a second time here.
         segments, _info = self._model.transcribe(
             audio,
-            beam_size=5,
-            vad_filter=True,
+            vad_filter=False,
             **kwargs,
         )
-        return " ".join(seg.text.strip() for seg in segments).strip()
+        return segments
+
+    def transcribe_words(self, audio: np.ndarray, final: bool = True,
+                         prompt: str = "") -> list[tuple[str, float]]:
+        """Return (word, end time in seconds) pairs for the audio.
+
+        ``prompt`` is the text preceding the audio, so decoding continues it
+        instead of starting a new sentence.
+        """
+        if self._model is None or len(audio) == 0:
+            return []
+        kwargs = {"initial_prompt": prompt} if prompt else {}
+        words = []
+        for seg in self._segments(audio, final, word_timestamps=True,
+                                  **kwargs):
+            for word in seg.words or ():
+                text = word.word.strip()
+                if text:
+                    words.append((text, word.end))
+        return words
+
+
+def _speech_bounds(audio: np.ndarray) -> tuple[int, int] | None:
+    """Return where the first speech in audio starts and the last one ends.
+
+    Offsets are in samples; None if the audio holds no speech.
+    """
+    # faster-whisper's bundled Silero model; it is loaded once and cached.
+    from faster_whisper.vad import get_speech_timestamps
+    spans = get_speech_timestamps(audio)
+    if not spans:
+        return None
+    return spans[0]["start"], spans[-1]["end"]
 
 
 _TRIM_EDGE_PUNCT_RE = re.compile(r"^[^\w]+|[^\w]+$")
+# Every ASCII character the regex above would trim, so ASCII words can use
+# str.strip() instead.
+_EDGE_CHARS = "".join(ch for ch in map(chr, range(128))
+                      if not re.match(r"\w", ch))
 
 
+# Consecutive passes mostly re-produce the same words, so each distinct word
+# is normalized once instead of on every comparison.
+@lru_cache(maxsize=4096)
 def _normalize_word(word: str) -> str:
     # Normalize only for matching stability; keep original tokens for injection.
     # Strip edge punctuation so "test," and "test" are treated the same.
+    if word.isascii():
+        return word.strip(_EDGE_CHARS).lower()
     return _TRIM_EDGE_PUNCT_RE.sub("", word).lower()
 
 
@@ -62,6 +138,9 @@ def _stable_prefix_len(prev_words: list[str], curr_words: list[str]) -> int:
     Stability is computed with a light normalization so punctuation changes don't
     cause rewinds (which would lead to duplicated injection).
     """
+    # Both lists only hold the uncommitted tail (a few dozen words at most
+    # within STREAM_WINDOW_S), so a plain loop is cheaper than preparing
+    # arrays for a compiled kernel would be.
     limit = min(len(prev_words), len(curr_words))
     stable = 0
     for i in range(limit):
@@ -79,69 +158,227 @@ def _stable_prefix_len(prev_words: list[str], curr_words: list[str]) -> int:
     return stable
 
 
-class TranscriptionWorker(QThread):
-    new_text_ready = Signal(str)
-    transcription_finished = Signal()
+# Audio before the unchecked part that is fed to VAD again, so speech that
+# starts right at a pass boundary is still long enough to be detected.
+VAD_CONTEXT_S = 0.5
+
+# Characters of committed text passed as the prompt for the next window.
+PROMPT_CHARS = 200
+
+# Longest stretch of uncommitted audio a pass transcribes before the words
+# in its older half are committed regardless of stability.
+STREAM_WINDOW_S = 15.0
+
+
+class TranscriptionWorker(QObject):
+    """Long-lived transcription worker, meant to be moved to its own QThread.
+
+    Sessions are driven by queued calls to start_session()/stop_session();
+    while a session is active, passes are paced by a QTimer on the worker's
+    thread. Outputs carry the session id so stale results can be ignored.
+
+    Each pass only transcribes the audio after the last committed word, so
+    its cost stays bounded however long the session runs.
+    """
 
-    def __init__(self, transcriber: Transcriber, audio_capture: AudioCapture,
-                 interval_ms: int = 1500, parent: QObject | None = None):
+    # (session id, offset, text): each committed delta and the session
+    # transcript length in characters before it. Deltas after the first need
+    # a separating space, which the receiver adds.
+    new_text_ready = Signal(int, int, str)
+    transcription_finished = Signal(int)
+
+    def __init__(self, transcriber: Transcriber | None = None,
+                 parent: QObject | None = None):
         super().__init__(parent)
         self._transcriber = transcriber
-        self._audio_capture = audio_capture
-        self._interval_ms = interval_ms
-        self._committed_len = 0
+        self._audio_capture: AudioCapture | None = None
+        self._capture_generation = 0
+        self._session_id = 0
+        self._interval_ms = 1500
+        self._window_samples = int(TARGET_SAMPLE_RATE * STREAM_WINDOW_S)
+        # Session audio offset just past the last committed word; passes
+        # start here.
+        self._processed_samples = 0
+        self._committed_chars = 0
+        # Tail of the committed text; each window starts mid-transcript.
+        self._prompt = ""
+        # VAD runs only over audio it has not seen yet. _speech_start and
+        # _speech_end are the session offsets where the uncommitted speech
+        # begins and where the latest detected speech ends.
+        self._vad_checked = 0
+        self._speech_start = 0
+        self._speech_end = 0
+        # End offset of the audio the previous pass transcribed, and whether
+        # that pass already re-ran audio that had not grown.
+        self._last_pass_end = 0
+        self._repeated_pass = False
+        # Uncommitted words of the previous pass, which started at the same
+        # offset as the next one.
         self._last_words: list[str] | None = None
-        self._stop_event = threading.Event()
 
-    def run(self):
-        self._committed_len = 0
-        self._last_words = None
-        self._stop_event.clear()
+        # Parented so it follows the worker into its thread on moveToThread().
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timer)
 
-        interval_s = max(self._interval_ms, 50) / 1000.0
-        while not self._stop_event.wait(timeout=interval_s):
-            self._do_transcription_pass(final=False)
+        # Session audio (already at TARGET_SAMPLE_RATE) copied out of the
+        # capture buffer incrementally, so each pass only copies the samples
+        # recorded since the previous one.
+        self._audio = np.empty(0, dtype=np.float32)
+        self._audio_len = 0
+        self._read_idx = 0
+
+    def set_transcriber(self, transcriber: Transcriber | None):
+        # Picked up by the next pass; a plain attribute swap is thread-safe.
+        self._transcriber = transcriber
 
-        # Final pass
+    @Slot(object, int, int)
+    def start_session(self, audio_capture: AudioCapture, session_id: int,
+                      interval_ms: int):
+        self._audio_capture = audio_capture
+        self._capture_generation = audio_capture.generation
+        self._session_id = session_id
+        self._interval_ms = max(interval_ms, 50)
+        self._processed_samples = 0
+        self._committed_chars = 0
+        self._prompt = ""
+        self._vad_checked = 0
+        self._speech_start = 0
+        self._speech_end = 0
+        self._last_pass_end = 0
+        self._repeated_pass = False
+        self._last_words = None
+        self._audio_len = 0
+        self._read_idx = 0
+        self._timer.start(self._interval_ms)
+
+    @Slot()
+    def stop_session(self):
+        if self._audio_capture is None:
+            return
+        self._timer.stop()
         self._do_transcription_pass(final=True)
-        self.transcription_finished.emit()
+        self._audio_capture = None
+        self.transcription_finished.emit(self._session_id)
+
+    @Slot()
+    def _on_timer(self):
+        if self._audio_capture is None:
+            return
+        self._do_transcription_pass(final=False)
+        # Restart after the pass so a slow pass doesn't queue up another, and
+        # pace on captured audio rather than wall time: the next pass is due
+        # once another interval of audio has arrived since this pass read the
+        # buffer, which is right away if the pass took longer than that.
+        pending = self._audio_capture.samples_recorded - self._read_idx
+        pending_ms = pending * 1000 // TARGET_SAMPLE_RATE
+        self._timer.start(max(self._interval_ms - pending_ms, 0))
+
+    def _pull_audio(self) -> np.ndarray:
+        capture = self._audio_capture
+        if capture.generation == self._capture_generation:
+            new, read_idx = capture.read_new(self._read_idx)
+            n = len(new)
+            end = self._audio_len + n
+            if end > len(self._audio):
+                min_size = TARGET_SAMPLE_RATE * INITIAL_BUFFER_SECONDS
+                grown = np.empty(max(len(self._audio) * 2, end, min_size),
+                                 dtype=np.float32)
+                grown[:self._audio_len] = self._audio[:self._audio_len]
+                self._audio = grown
+            self._audio[self._audio_len:end] = new
+            # Only keep the copy if no newer session reset the shared capture
+            # buffer meanwhile (e.g. when this session's final pass runs late).
+            if capture.generation == self._capture_generation:
+                self._read_idx = read_idx
+                self._audio_len = end
+        return self._audio[:self._audio_len]
 
     def _do_transcription_pass(self, *, final: bool):
-        audio = self._audio_capture.get_buffer()
-        source_sr = self._audio_capture.sample_rate
-        min_samples = int(source_sr * 0.3)
-        if len(audio) < min_samples:
+        audio_16k = self._pull_audio()
+        start = self._processed_samples
+        tail = audio_16k[start:]
+        min_samples = int(TARGET_SAMPLE_RATE * 0.3)
+        transcriber = self._transcriber
+        if transcriber is None:
+            return
+        # The final pass must flush whatever follows the last committed word,
+        # however short; only a recording too short as a whole is skipped.
+        if len(audio_16k) < min_samples if final else len(tail) < min_samples:
+            return
+        # Skip the encoder entirely while nothing after the last committed
+        # word is speech, and leave leading and trailing silence out of the
+        # window: Whisper tends to hallucinate on it.
+        self._update_speech_bounds(audio_16k)
+        if self._speech_end <= start:
             return
+        context = int(TARGET_SAMPLE_RATE * VAD_CONTEXT_S)
+        start = max(start, self._speech_start - context)
+        tail = audio_16k[start:self._speech_end + context]
 
-        audio_16k = resample_audio(audio, source_sr, TARGET_SAMPLE_RATE)
-        full_text = self._transcriber.transcribe(audio_16k)
-        if not full_text:
+        # Without new audio a pass would only repeat the previous one. One
+        # repeat is still useful: it lets the words of the last pass agree
+        # with themselves and get committed while the user pauses.
+        tail_end = start + len(tail)
+        grown = tail_end - self._last_pass_end >= min_samples
+        if not final and not grown and self._repeated_pass:
             return
+        self._repeated_pass = not grown
+        self._last_pass_end = tail_end
 
-        words = full_text.split()
-        if not words:
+        timed_words = transcriber.transcribe_words(tail, final=final,
+                                                   prompt=self._prompt)
+        if not timed_words:
             return
+        words = [word for word, _end in timed_words]
 
-        # Commit only stable text while recording to avoid duplicating content
-        # when the model revises earlier words (common with "retranscribe buffer"
-        # strategies). On the final pass, commit everything remaining.
+        # Commit only text that two consecutive passes agree on while
+        # recording, to avoid duplicating content when the model revises its
+        # latest words. On the final pass, commit everything remaining.
         if final:
             commit_upto = len(words)
         else:
-            if self._last_words is None:
-                self._last_words = words
-                return
-            stable_upto = _stable_prefix_len(self._last_words, words)
-            commit_upto = max(self._committed_len, stable_upto)
-
-        if commit_upto > self._committed_len:
-            new_words = words[self._committed_len:commit_upto]
-            if new_words:
-                prefix = "" if self._committed_len == 0 else " "
-                self.new_text_ready.emit(prefix + " ".join(new_words))
-            self._committed_len = commit_upto
-
-        self._last_words = words
-
-    def request_stop(self):
-        self._stop_event.set()
+            commit_upto = 0
+            if self._last_words is not None:
+                commit_upto = _stable_prefix_len(self._last_words, words)
+            # Keep the window bounded: once the uncommitted audio outgrows
+            # it, commit the words in its older half even if still unstable.
+            if len(tail) > self._window_samples:
+                cutoff = len(tail) - self._window_samples // 2
+                cutoff_s = cutoff / TARGET_SAMPLE_RATE
+                forced = 0
+                for _word, end in timed_words:
+                    if end > cutoff_s:
+                        break
+                    forced += 1
+                commit_upto = max(commit_upto, forced)
+
+        if commit_upto > 0:
+            text = " ".join(words[:commit_upto])
+            offset = self._committed_chars
+            self.new_text_ready.emit(self._session_id, offset, text)
+            self._committed_chars = offset + len(text) + (1 if offset else 0)
+            prompt = f"{self._prompt} {text}" if self._prompt else text
+            self._prompt = prompt[-PROMPT_CHARS:]
+            end_s = timed_words[commit_upto - 1][1]
+            self._processed_samples = min(
+                start + int(end_s * TARGET_SAMPLE_RATE), len(audio_16k))
+
+        self._last_words = words[commit_upto:]
+
+    def _update_speech_bounds(self, audio_16k: np.ndarray):
+        if len(audio_16k) <= self._vad_checked:
+            return
+        context = int(TARGET_SAMPLE_RATE * VAD_CONTEXT_S)
+        begin = max(0, self._vad_checked - context)
+        bounds = _speech_bounds(audio_16k[begin:])
+        if bounds is not None:
+            first_start, last_end = bounds
+            # Only move the start once all earlier speech is committed, so
+            # no uncommitted words are cut off the front of the window. VAD
+            # spans are padded, so the last committed word may end up to
+            # about a context length before the span does.
+            if self._speech_end <= self._processed_samples + context:
+                self._speech_start = begin + first_start
+            self._speech_end = max(self._speech_end, begin + last_end)
+        self._vad_checked = len(audio_16k)
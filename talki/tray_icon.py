@@ -1,19 +1,45 @@
 """System tray icon with programmatic icons and context menu."""
 
 import math
+from functools import lru_cache
 
 from PySide6.QtWidgets import QSystemTrayIcon, QMenu
 from PySide6.QtGui import QPixmap, QPainter, QColor, QPen, QBrush, QIcon
-from PySide6.QtCore import QObject, Signal, QRectF
+from PySide6.QtCore import QObject, Signal, QRectF, QTimer
 
 
 STATE_IDLE = "idle"
 STATE_LISTENING = "listening"
 STATE_PROCESSING = "processing"
 
-
-def _create_icon(state: str, size: int = 64) -> QIcon:
-    """Generate a tray icon programmatically via QPainter."""
+# Pixel sizes rendered into each icon, so Qt can pick an exact match for the
+# tray and the screen's device pixel ratio instead of rescaling one pixmap.
+ICON_SIZES = (16, 22, 32, 48, 64)
+
+# The processing spinner's three dots sit 120 degrees apart, so one turn of
+# 120 degrees loops the animation. Each frame holds the (cos, sin) of every
+# dot's angle, computed once here rather than while painting.
+SPINNER_FRAMES = 12
+SPINNER_INTERVAL_MS = 100
+_SPINNER_OFFSETS = tuple(
+    tuple((math.cos(a), math.sin(a))
+          for a in (math.radians(i * 120 + frame * 120 / SPINNER_FRAMES)
+                    for i in range(3)))
+    for frame in range(SPINNER_FRAMES)
+)
+
+
+@lru_cache(maxsize=None)
+def _create_icon(state: str, frame: int = 0) -> QIcon:
+    """Return the tray icon for a state, rendered once per process."""
+    icon = QIcon()
+    for size in ICON_SIZES:
+        icon.addPixmap(_render_pixmap(state, size, frame))
+    return icon
+
+
+def _render_pixmap(state: str, size: int, frame: int = 0) -> QPixmap:
+    """Draw the tray icon for a state programmatically via QPainter."""
     pixmap = QPixmap(size, size)
     pixmap.fill(QColor(0, 0, 0, 0))
 
@@ -86,14 +112,14 @@ def _create_icon(state: str, size: int = 64) -> QIcon:
         dot_pen = QPen(QColor(255, 152, 0))
         painter.setPen(dot_pen)
         painter.setBrush(QBrush(QColor(255, 152, 0)))
-        for i in range(3):
-            angle = (i * 120) * math.pi / 180
-            dot_x = cx + math.cos(angle) * size * 0.08 + size * 0.28
-            dot_y = cy - size * 0.1 + math.sin(angle) * size * 0.08
-            painter.drawEllipse(QRectF(dot_x - 2, dot_y - 2, 4, 4))
+        r = size / 32
+        for cos_a, sin_a in _SPINNER_OFFSETS[frame]:
+            dot_x = cx + cos_a * size * 0.08 + size * 0.28
+            dot_y = cy - size * 0.1 + sin_a * size * 0.08
+            painter.drawEllipse(QRectF(dot_x - r, dot_y - r, 2 * r, 2 * r))
 
     painter.end()
-    return QIcon(pixmap)
+    return pixmap
 
 
 class TrayIcon(QSystemTrayIcon):
@@ -103,11 +129,20 @@ class TrayIcon(QSystemTrayIcon):
     def __init__(self, parent: QObject | None = None):
         super().__init__(parent)
         self._state = STATE_IDLE
+        # Pre-rendered so animating only swaps icons.
+        self._processing_frames = [
+            _create_icon(STATE_PROCESSING, frame)
+            for frame in range(SPINNER_FRAMES)
+        ]
         self._icons = {
             STATE_IDLE: _create_icon(STATE_IDLE),
             STATE_LISTENING: _create_icon(STATE_LISTENING),
-            STATE_PROCESSING: _create_icon(STATE_PROCESSING),
+            STATE_PROCESSING: self._processing_frames[0],
         }
+        self._frame = 0
+        self._spinner = QTimer(self)
+        self._spinner.setInterval(SPINNER_INTERVAL_MS)
+        self._spinner.timeout.connect(self._next_frame)
         self._status_action = None
         self._setup_menu()
         self.set_state(STATE_IDLE)
@@ -129,6 +164,11 @@ class TrayIcon(QSystemTrayIcon):
         self._state = state
         icon = self._icons.get(state, self._icons[STATE_IDLE])
         self.setIcon(icon)
+        if state == STATE_PROCESSING:
+            self._frame = 0
+            self._spinner.start()
+        else:
+            self._spinner.stop()
 
         labels = {
             STATE_IDLE: "Idle",
@@ -140,6 +180,10 @@ class TrayIcon(QSystemTrayIcon):
         if self._status_action:
             self._status_action.setText(f"Status: {label}")
 
+    def _next_frame(self):
+        self._frame = (self._frame + 1) % SPINNER_FRAMES
+        self.setIcon(self._processing_frames[self._frame])
+
     def _on_activated(self, reason):
         if reason in (QSystemTrayIcon.ActivationReason.Trigger,
                       QSystemTrayIcon.ActivationReason.DoubleClick):